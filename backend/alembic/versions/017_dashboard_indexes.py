@@ -0,0 +1,51 @@
+"""Add composite indexes for dashboard queries
+
+Revision ID: 017_dashboard_indexes
+Revises: 016_fix_computed_cols
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '017_dashboard_indexes'
+down_revision = '016_fix_computed_cols'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    
+    def index_exists(table_name, index_name):
+        try:
+            indexes = inspector.get_indexes(table_name)
+            return any(idx['name'] == index_name for idx in indexes)
+        except Exception:
+            return True  # Skip if table doesn't exist
+    
+    # Dashboard "new in last 24h / 7d" and status-scoped date ranges
+    if not index_exists('opportunities', 'ix_opportunities_status_created'):
+        op.create_index(
+            'ix_opportunities_status_created',
+            'opportunities',
+            ['status', 'created_at'],
+            postgresql_using='btree'
+        )
+    
+    # Upcoming deadlines (may already exist from 014)
+    if not index_exists('opportunities', 'ix_opportunities_status_deadline'):
+        op.create_index(
+            'ix_opportunities_status_deadline',
+            'opportunities',
+            ['status', 'deadline_at'],
+            postgresql_using='btree'
+        )
+
+
+def downgrade() -> None:
+    try:
+        op.drop_index('ix_opportunities_status_created', table_name='opportunities')
+    except Exception:
+        pass  # Index might not exist
@@ -0,0 +1,55 @@
+"""Add composite indexes for ingestion run listing
+
+Revision ID: 018_ingestion_run_indexes
+Revises: 017_dashboard_indexes
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '018_ingestion_run_indexes'
+down_revision = '017_dashboard_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    
+    def index_exists(table_name, index_name):
+        try:
+            indexes = inspector.get_indexes(table_name)
+            return any(idx['name'] == index_name for idx in indexes)
+        except Exception:
+            return True  # Skip if table doesn't exist
+    
+    # ORDER BY started_at DESC LIMIT n, optionally filtered by status/source.
+    # Built CONCURRENTLY so ingestion workers aren't blocked on a large table.
+    with op.get_context().autocommit_block():
+        if not index_exists('ingestion_runs', 'ix_ingestion_runs_status_started'):
+            op.create_index(
+                'ix_ingestion_runs_status_started',
+                'ingestion_runs',
+                ['status', sa.text('started_at DESC')],
+                postgresql_using='btree',
+                postgresql_concurrently=True,
+            )
+        
+        if not index_exists('ingestion_runs', 'ix_ingestion_runs_source_started'):
+            op.create_index(
+                'ix_ingestion_runs_source_started',
+                'ingestion_runs',
+                ['source_config_id', sa.text('started_at DESC')],
+                postgresql_using='btree',
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    for index_name in ('ix_ingestion_runs_status_started', 'ix_ingestion_runs_source_started'):
+        try:
+            op.drop_index(index_name, table_name='ingestion_runs')
+        except Exception:
+            pass  # Index might not exist
@@ -0,0 +1,66 @@
+"""Add indexes backing opportunity list sorts, budget stats and notes/tasks
+
+Revision ID: 019_opportunity_list_indexes
+Revises: 018_ingestion_run_indexes
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '019_opportunity_list_indexes'
+down_revision = '018_ingestion_run_indexes'
+branch_labels = None
+depends_on = None
+
+
+# (table, index name, columns, partial WHERE clause)
+INDEXES = [
+    # status filter + budget sort (status + score/created/deadline already exist)
+    ('opportunities', 'ix_opportunities_status_budget', ['status', 'budget_amount'], None),
+    # has_budget=true and /budget-stats only ever read rows with a budget
+    ('opportunities', 'ix_opportunities_budget_present', ['budget_amount'], 'budget_amount IS NOT NULL'),
+    # Keyset pagination: (sort column, id) in the cursor's DESC NULLS LAST order
+    ('opportunities', 'ix_opportunities_score_id',
+     [sa.text('score DESC NULLS LAST'), sa.text('id DESC')], None),
+    ('opportunities', 'ix_opportunities_created_id',
+     [sa.text('created_at DESC NULLS LAST'), sa.text('id DESC')], None),
+    # Notes and tasks lists per opportunity
+    ('opportunity_notes', 'ix_opportunity_notes_opportunity_created',
+     ['opportunity_id', sa.text('created_at DESC')], None),
+    ('opportunity_tasks', 'ix_opportunity_tasks_opportunity_due',
+     ['opportunity_id', 'due_date'], None),
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    
+    def index_exists(table_name, index_name):
+        try:
+            indexes = inspector.get_indexes(table_name)
+            return any(idx['name'] == index_name for idx in indexes)
+        except Exception:
+            return True  # Skip if table doesn't exist
+    
+    with op.get_context().autocommit_block():
+        for table_name, index_name, columns, where in INDEXES:
+            if index_exists(table_name, index_name):
+                continue
+            op.create_index(
+                index_name,
+                table_name,
+                columns,
+                postgresql_using='btree',
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    for table_name, index_name, _, _ in INDEXES:
+        try:
+            op.drop_index(index_name, table_name=table_name)
+        except Exception:
+            pass  # Index might not exist
@@ -0,0 +1,53 @@
+"""Add generated full-text search column and GIN index on opportunities
+
+Revision ID: 020_opportunity_search_tsv
+Revises: 019_opportunity_list_indexes
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '020_opportunity_search_tsv'
+down_revision = '019_opportunity_list_indexes'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_TSV = (
+    "setweight(to_tsvector('french', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('french', coalesce(organization, '')), 'B') || "
+    "setweight(to_tsvector('french', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    
+    columns = [col['name'] for col in inspector.get_columns('opportunities')]
+    if 'search_tsv' not in columns:
+        # Rewrites the table once to fill the stored column
+        op.execute(
+            f"ALTER TABLE opportunities ADD COLUMN search_tsv tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_TSV}) STORED"
+        )
+    
+    indexes = [idx['name'] for idx in inspector.get_indexes('opportunities')]
+    if 'ix_opportunities_search_tsv' not in indexes:
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_opportunities_search_tsv',
+                'opportunities',
+                ['search_tsv'],
+                postgresql_using='gin',
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    try:
+        op.drop_index('ix_opportunities_search_tsv', table_name='opportunities')
+    except Exception:
+        pass  # Index might not exist
+    op.execute("ALTER TABLE opportunities DROP COLUMN IF EXISTS search_tsv")
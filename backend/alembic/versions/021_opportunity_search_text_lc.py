@@ -0,0 +1,37 @@
+"""Add generated lowercased search text column on opportunities
+
+Revision ID: 021_opportunity_search_text_lc
+Revises: 020_opportunity_search_tsv
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '021_opportunity_search_text_lc'
+down_revision = '020_opportunity_search_tsv'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_TEXT_LC = (
+    "lower(coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || "
+    "coalesce(organization, ''))"
+)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    
+    columns = [col['name'] for col in inspector.get_columns('opportunities')]
+    if 'search_text_lc' not in columns:
+        # Rewrites the table once to fill the stored column
+        op.execute(
+            f"ALTER TABLE opportunities ADD COLUMN search_text_lc text "
+            f"GENERATED ALWAYS AS ({SEARCH_TEXT_LC}) STORED"
+        )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE opportunities DROP COLUMN IF EXISTS search_text_lc")
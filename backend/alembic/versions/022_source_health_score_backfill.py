@@ -0,0 +1,38 @@
+"""Backfill source_health.health_score from stored metrics
+
+Revision ID: 022_source_health_score_backfill
+Revises: 021_opportunity_search_text_lc
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+# revision identifiers
+revision = '022_source_health_score_backfill'
+down_revision = '021_opportunity_search_text_lc'
+branch_labels = None
+depends_on = None
+
+
+# SQL port of app.api.source_health.compute_health_score
+HEALTH_SCORE_SQL = """
+GREATEST(0, LEAST(100,
+    100
+    - CASE WHEN coalesce(success_rate, 1.0) < 0.9
+           THEN trunc((0.9 - coalesce(success_rate, 1.0)) * 50)::int ELSE 0 END
+    - CASE WHEN coalesce(avg_latency_ms, 0) > 5000 THEN 20
+           WHEN coalesce(avg_latency_ms, 0) > 2000 THEN 10 ELSE 0 END
+    - CASE WHEN coalesce(duplicates_rate, 0) > 0.8 THEN 30
+           WHEN coalesce(duplicates_rate, 0) > 0.5 THEN 15 ELSE 0 END
+    - CASE WHEN coalesce(items_found, 0) = 0 THEN 20 ELSE 0 END
+))
+"""
+
+
+def upgrade() -> None:
+    # Rows written before the score was computed at insert time
+    op.execute(f"UPDATE source_health SET health_score = {HEALTH_SCORE_SQL}")
+
+
+def downgrade() -> None:
+    # Data-only migration, previous scores are not recoverable
+    pass
@@ -0,0 +1,43 @@
+"""Index daily shortlists by (profile_id, date)
+
+Revision ID: 023_daily_shortlist_profile_date
+Revises: 022_source_health_score_backfill
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '023_daily_shortlist_profile_date'
+down_revision = '022_source_health_score_backfill'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = {idx['name'] for idx in inspector.get_indexes('daily_shortlists')}
+    
+    with op.get_context().autocommit_block():
+        # /today and per-profile lists: profile_id = ? ORDER BY date DESC
+        if 'ix_daily_shortlist_profile_date' not in indexes:
+            op.create_index(
+                'ix_daily_shortlist_profile_date',
+                'daily_shortlists',
+                ['profile_id', 'date'],
+                unique=True,
+                postgresql_concurrently=True,
+            )
+        # Same columns as uq_daily_shortlist_date_profile's own index
+        if 'ix_shortlist_date_profile' in indexes:
+            op.drop_index(
+                'ix_shortlist_date_profile',
+                table_name='daily_shortlists',
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    op.create_index('ix_shortlist_date_profile', 'daily_shortlists', ['date', 'profile_id'])
+    op.drop_index('ix_daily_shortlist_profile_date', table_name='daily_shortlists')
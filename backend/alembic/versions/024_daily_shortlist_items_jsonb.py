@@ -0,0 +1,38 @@
+"""Store daily_shortlists.items as JSONB
+
+Revision ID: 024_daily_shortlist_items_jsonb
+Revises: 023_daily_shortlist_profile_date
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '024_daily_shortlist_items_jsonb'
+down_revision = '023_daily_shortlist_profile_date'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    
+    columns = {col['name']: col for col in inspector.get_columns('daily_shortlists')}
+    if not isinstance(columns['items']['type'], postgresql.JSONB):
+        op.alter_column(
+            'daily_shortlists',
+            'items',
+            type_=postgresql.JSONB(),
+            postgresql_using='items::jsonb',
+        )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'daily_shortlists',
+        'items',
+        type_=postgresql.JSON(),
+        postgresql_using='items::json',
+    )
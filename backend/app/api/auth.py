@@ -19,7 +19,7 @@ from app.core.security import (
 from app.core.two_factor import two_factor_auth
 from app.core.activity_logger import ActivityLogger, Actions
 from app.schemas.user import UserLogin, Token, UserResponse, LoginResponse
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user_record
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -217,7 +217,7 @@ def refresh_token(
 
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_record)
 ):
     """Get current user information"""
     return current_user
@@ -245,7 +245,7 @@ class TwoFactorStatusResponse(BaseModel):
 
 @router.get("/2fa/status", response_model=TwoFactorStatusResponse)
 def get_2fa_status(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user_record)
 ):
     """Check if 2FA is enabled for current user"""
     return TwoFactorStatusResponse(
@@ -256,7 +256,7 @@ def get_2fa_status(
 
 @router.post("/2fa/setup", response_model=TwoFactorSetupResponse)
 def setup_2fa(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
     db: Session = Depends(get_db)
 ):
     """
@@ -287,7 +287,7 @@ def setup_2fa(
 @router.post("/2fa/enable")
 def enable_2fa(
     data: TwoFactorEnableRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
     db: Session = Depends(get_db)
 ):
     """
@@ -316,7 +316,7 @@ def enable_2fa(
 @router.post("/2fa/disable")
 def disable_2fa(
     data: TwoFactorVerifyRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
     db: Session = Depends(get_db)
 ):
     """
@@ -390,7 +390,7 @@ def verify_2fa_code(
 @router.post("/2fa/regenerate-backup-codes")
 def regenerate_backup_codes(
     data: TwoFactorVerifyRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
     db: Session = Depends(get_db)
 ):
     """
@@ -1,19 +1,26 @@
 """
 Contact Finder API - Web Enrichment for Missing Contacts
 """
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from urllib.parse import unquote, urlparse
 from uuid import UUID
 import time
 import re
 import logging
+import threading
+
+import lxml.html
+from lxml import etree
 
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlalchemy.orm import Session
 
 from app.db import get_db
 from app.db.models import Opportunity, ContactFinderResult
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, RateLimiter
+from app.core.cache import cache_get, cache_set
 from app.schemas.radar_features import (
     ContactFinderRequest,
     ContactFinderResponse,
@@ -39,29 +46,154 @@ DEFAULT_ALLOWED_DOMAINS = [
     "equipe",
 ]
 
+# Contact pages probed after the original URL (priority order)
+CONTACT_PATHS = (
+    "/contact",
+    "/contact.html",
+    "/contact-us",
+    "/nous-contacter",
+    "/about",
+    "/a-propos",
+    "/team",
+    "/equipe",
+)
+
 # Rate limiting
 RATE_LIMIT_REQUESTS_PER_MINUTE = 10
+rate_limit_find_contact = RateLimiter("contact_finder", RATE_LIMIT_REQUESTS_PER_MINUTE, 60)
+
+# Found contacts are shared by every opportunity of the same organization site
+DOMAIN_CACHE_TTL = 86400  # 24 hours
+
+# Contact info sits near the top of a page; never read more than this
+MAX_PAGE_BYTES = 256 * 1024
+READ_CHUNK_SIZE = 16 * 1024
+
+# Politeness: at most this many in-flight requests per target domain.
+# find_contact is a sync endpoint served from the threadpool, so this is
+# a threading semaphore rather than an asyncio one.
+# Entries are {netloc: [semaphore, users]} and dropped once no request
+# holds or waits on them, so the dict only covers in-flight domains.
+MAX_CONCURRENT_PER_DOMAIN = 2
+_domain_semaphores: dict[str, list] = {}
+_domain_semaphores_lock = threading.Lock()
+
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+
+# French phone numbers: prefixed (+33 / 0033 / 0) or plain dotted/spaced groups.
+# One alternation so the page is scanned once.
+_PHONE_RE = re.compile(
+    r'(?:\+33|0033|0)[1-9](?:[\s.-]?\d{2}){4}'
+    r'|\d{2}[\s.-]\d{2}[\s.-]\d{2}[\s.-]\d{2}[\s.-]\d{2}'
+)
+
+
+def extract_emails_with_positions(text: str) -> List[Tuple[str, int]]:
+    """Extract email addresses with the offset of their first occurrence"""
+    # Keep page order so the first match on the page wins
+    found = {}
+    for match in _EMAIL_RE.finditer(text):
+        email = match.group(0)
+        # Filter out common fake emails
+        if email not in found and not _is_fake_email(email):
+            found[email] = match.start()
+    return list(found.items())
 
 
 def extract_emails(text: str) -> List[str]:
     """Extract email addresses from text"""
-    pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-    emails = re.findall(pattern, text)
-    # Filter out common fake emails
-    filtered = [e for e in emails if not any(x in e.lower() for x in ['example', 'test', 'noreply', 'no-reply'])]
-    return list(set(filtered))
+    return [email for email, _ in extract_emails_with_positions(text)]
+
+
+def _is_fake_email(email: str) -> bool:
+    """Placeholder / no-reply addresses that are never a real contact"""
+    lowered = email.lower()
+    return any(x in lowered for x in ['example', 'test', 'noreply', 'no-reply'])
+
+
+def extract_link_contacts(html: str) -> Tuple[List[str], List[str]]:
+    """
+    Extract emails and phones from mailto:/tel: anchors.
+    Much cheaper than regex over the whole page and catches
+    entity-encoded addresses that the text regex misses.
+    """
+    if "mailto:" not in html and "tel:" not in html:
+        return [], []
+    
+    try:
+        tree = lxml.html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return [], []
+    
+    emails = []
+    for href in tree.xpath('//a[starts-with(@href, "mailto:")]/@href'):
+        email = unquote(href[7:].split("?")[0]).strip()
+        if _EMAIL_RE.fullmatch(email) and not _is_fake_email(email):
+            emails.append(email)
+    
+    phones = []
+    for href in tree.xpath('//a[starts-with(@href, "tel:")]/@href'):
+        phone = unquote(href[4:]).strip()
+        if phone:
+            phones.append(phone)
+    
+    return emails, phones
 
 
 def extract_phones(text: str) -> List[str]:
     """Extract phone numbers from text (French format)"""
-    patterns = [
-        r'(?:\+33|0033|0)[1-9](?:[\s.-]?\d{2}){4}',
-        r'\d{2}[\s.-]\d{2}[\s.-]\d{2}[\s.-]\d{2}[\s.-]\d{2}',
-    ]
-    phones = []
-    for pattern in patterns:
-        phones.extend(re.findall(pattern, text))
-    return list(set(phones))
+    return list(dict.fromkeys(_PHONE_RE.findall(text)))
+
+
+def domain_cache_key(url: Optional[str]) -> Optional[str]:
+    """Cache key for a website, normalized on its domain"""
+    if not url:
+        return None
+    netloc = urlparse(url).netloc.lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+    return f"contact_finder:domain:{netloc}" if netloc else None
+
+
+@contextmanager
+def _domain_slot(url: str):
+    """Hold one of the domain's MAX_CONCURRENT_PER_DOMAIN request slots"""
+    netloc = urlparse(url).netloc.lower()
+    with _domain_semaphores_lock:
+        entry = _domain_semaphores.get(netloc)
+        if entry is None:
+            entry = [threading.BoundedSemaphore(MAX_CONCURRENT_PER_DOMAIN), 0]
+            _domain_semaphores[netloc] = entry
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _domain_semaphores_lock:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del _domain_semaphores[netloc]
+
+
+def fetch_page_text(client, url: str, headers: dict) -> Optional[str]:
+    """
+    Stream a page and return at most MAX_PAGE_BYTES of decoded text.
+    Returns None for non-200 responses.
+    """
+    with _domain_slot(url), client.stream("GET", url, headers=headers) as response:
+        if response.status_code != 200:
+            return None
+        
+        chunks = []
+        size = 0
+        for chunk in response.iter_bytes(chunk_size=READ_CHUNK_SIZE):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_PAGE_BYTES:
+                break
+        
+        body = b"".join(chunks)[:MAX_PAGE_BYTES]
+        return body.decode(response.encoding or "utf-8", errors="ignore")
 
 
 def search_official_website(url: str, allowed_domains: List[str]) -> dict:
@@ -90,22 +222,11 @@ def search_official_website(url: str, allowed_domains: List[str]) -> dict:
     
     try:
         # Parse base domain
-        from urllib.parse import urlparse, urljoin
         parsed = urlparse(url)
         base_url = f"{parsed.scheme}://{parsed.netloc}"
         
-        # URLs to check (priority order)
-        urls_to_check = [
-            url,  # Original URL
-            urljoin(base_url, "/contact"),
-            urljoin(base_url, "/contact.html"),
-            urljoin(base_url, "/contact-us"),
-            urljoin(base_url, "/nous-contacter"),
-            urljoin(base_url, "/about"),
-            urljoin(base_url, "/a-propos"),
-            urljoin(base_url, "/team"),
-            urljoin(base_url, "/equipe"),
-        ]
+        # URLs to check (priority order): original URL, then contact pages
+        urls_to_check = [url] + [base_url + path for path in CONTACT_PATHS]
         
         headers = {
             "User-Agent": "Mozilla/5.0 (compatible; RadarBot/1.0; +https://radarapp.fr/bot)"
@@ -117,19 +238,22 @@ def search_official_website(url: str, allowed_domains: List[str]) -> dict:
                 result["pages_crawled"] += 1
                 
                 try:
-                    response = client.get(check_url, headers=headers)
+                    text = fetch_page_text(client, check_url, headers)
                     
-                    if response.status_code == 200:
-                        text = response.text
+                    if text is not None:
+                        # mailto:/tel: anchors first, full-text regex as fallback
+                        link_emails, link_phones = extract_link_contacts(text)
+                        if link_emails:
+                            email, email_pos = link_emails[0], text.find(link_emails[0])
+                        else:
+                            matches = extract_emails_with_positions(text) if "@" in text else []
+                            email, email_pos = matches[0] if matches else (None, -1)
                         
-                        # Extract emails
-                        emails = extract_emails(text)
-                        if emails:
-                            result["email"] = emails[0]
+                        if email:
+                            result["email"] = email
                             result["evidence_url"] = check_url
                             
-                            # Find snippet around email
-                            email_pos = text.lower().find(emails[0].lower())
+                            # Snippet around the email's position in the page
                             if email_pos >= 0:
                                 start = max(0, email_pos - 100)
                                 end = min(len(text), email_pos + 150)
@@ -143,7 +267,7 @@ def search_official_website(url: str, allowed_domains: List[str]) -> dict:
                         
                         # Extract phones if no email found
                         if not result["found"]:
-                            phones = extract_phones(text)
+                            phones = link_phones or extract_phones(text)
                             if phones:
                                 result["phone"] = phones[0]
                                 result["evidence_url"] = check_url
@@ -161,13 +285,23 @@ def search_official_website(url: str, allowed_domains: List[str]) -> dict:
     return result
 
 
+def _result_unchanged(existing: ContactFinderResult, status_str: str, search_result: dict) -> bool:
+    """Whether a stored result already matches a fresh search outcome"""
+    return (
+        existing.status == status_str
+        and existing.contact_email == search_result.get("email")
+        and existing.contact_phone == search_result.get("phone")
+        and existing.evidence_url == search_result.get("evidence_url")
+    )
+
+
 @router.post("/opportunities/{opportunity_id}/find", response_model=ContactFinderResponse)
 def find_contact(
     opportunity_id: UUID,
     data: ContactFinderRequest = ContactFinderRequest(),
     background_tasks: BackgroundTasks = None,
     db: Session = Depends(get_db),
-    current_user = Depends(get_current_user),
+    current_user = Depends(rate_limit_find_contact),
 ):
     """
     Find contact information for an opportunity.
@@ -210,10 +344,16 @@ def find_contact(
     # Perform search
     allowed_domains = data.allowed_domains or DEFAULT_ALLOWED_DOMAINS
     
-    search_result = search_official_website(
-        opportunity.url_primary,
-        allowed_domains
-    )
+    cache_key = domain_cache_key(opportunity.url_primary)
+    search_result = cache_get(cache_key) if cache_key else None
+    
+    if search_result is None:
+        search_result = search_official_website(
+            opportunity.url_primary,
+            allowed_domains
+        )
+        if cache_key and search_result["found"]:
+            cache_set(cache_key, search_result, DOMAIN_CACHE_TTL)
     
     duration_ms = int((time.time() - start_time) * 1000)
     
@@ -224,7 +364,10 @@ def find_contact(
         status_str = "not_found"
     
     # Create or update result
-    if existing:
+    if existing and _result_unchanged(existing, status_str, search_result):
+        # Same outcome as last time, nothing to write
+        result = existing
+    elif existing:
         existing.status = status_str
         existing.contact_email = search_result.get("email")
         existing.contact_phone = search_result.get("phone")
@@ -235,9 +378,6 @@ def find_contact(
         existing.search_duration_ms = duration_ms
         existing.pages_crawled = search_result.get("pages_crawled", 0)
         existing.updated_at = datetime.utcnow()
-        
-        db.commit()
-        db.refresh(existing)
         result = existing
     else:
         result = ContactFinderResult(
@@ -255,8 +395,6 @@ def find_contact(
             pages_crawled=search_result.get("pages_crawled", 0),
         )
         db.add(result)
-        db.commit()
-        db.refresh(result)
     
     # If found, update opportunity
     if status_str == "found":
@@ -266,7 +404,10 @@ def find_contact(
             opportunity.contact_phone = search_result["phone"]
         if search_result.get("evidence_url"):
             opportunity.contact_url = search_result["evidence_url"]
-        db.commit()
+    
+    # Result and opportunity are written in one transaction
+    db.commit()
+    db.refresh(result)
     
     return ContactFinderResponse(
         id=result.id,
@@ -2,9 +2,10 @@
 Dashboard endpoints with Redis caching for performance
 """
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, List
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy import func, and_
 from sqlalchemy.orm import Session
 
@@ -13,9 +14,10 @@ from app.db.models.user import User
 from app.db.models.opportunity import Opportunity, OpportunityStatus, OpportunityCategory
 from app.db.models.ingestion import IngestionRun, IngestionStatus
 from app.api.deps import get_current_user
-from app.core.cache import cache_get, cache_set
+from app.core.cache import cache_get_or_set_locked
 
-router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+# Plain dict payloads, serialized with orjson instead of stdlib json
+router = APIRouter(prefix="/dashboard", tags=["dashboard"], default_response_class=ORJSONResponse)
 
 # Cache TTL constants
 STATS_CACHE_TTL = 60  # 1 minute for dashboard stats
@@ -28,13 +30,16 @@ def get_dashboard_stats(
     current_user: User = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """Get dashboard statistics with caching"""
-    cache_key = f"dashboard:stats:{current_user.id}"
-    
-    # Try cache first
-    cached = cache_get(cache_key)
-    if cached:
-        return cached
-    
+    # Stats are workspace-wide, so one cache entry serves every user
+    return cache_get_or_set_locked(
+        "dashboard:stats:global",
+        STATS_CACHE_TTL,
+        lambda: _compute_dashboard_stats(db),
+    )
+
+
+def _compute_dashboard_stats(db: Session) -> Dict[str, Any]:
+    """Run the dashboard aggregation queries"""
     now = datetime.utcnow()
     
     # Total opportunities by status
@@ -116,14 +121,11 @@ def get_dashboard_stats(
         "new_7d": new_7d,
         "deadlines_7d": deadlines_7d,
         "win_rate": win_rate,
-        "avg_score_new": round(avg_score, 1),
+        "avg_score_new": round(float(avg_score), 1),
         "budget_won": float(total_budget_won),
         "budget_pipeline": float(total_budget_pipeline),
     }
     
-    # Cache the result
-    cache_set(cache_key, result, STATS_CACHE_TTL)
-    
     return result
 
 
@@ -134,13 +136,15 @@ def get_top_opportunities(
     current_user: User = Depends(get_current_user),
 ):
     """Get top scored opportunities with caching"""
-    cache_key = f"dashboard:top:{current_user.id}:{limit}"
-    
-    # Try cache first
-    cached = cache_get(cache_key)
-    if cached:
-        return cached
-    
+    return cache_get_or_set_locked(
+        f"dashboard:top:{limit}",
+        TOP_OPPS_CACHE_TTL,
+        lambda: _compute_top_opportunities(db, limit),
+    )
+
+
+def _compute_top_opportunities(db: Session, limit: int) -> List[Dict[str, Any]]:
+    """Fetch top scored open opportunities"""
     opportunities = db.query(Opportunity).filter(
         Opportunity.status.in_([
             OpportunityStatus.NEW,
@@ -163,9 +167,6 @@ def get_top_opportunities(
         for o in opportunities
     ]
     
-    # Cache the result
-    cache_set(cache_key, result, TOP_OPPS_CACHE_TTL)
-    
     return result
 
 
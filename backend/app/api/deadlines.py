@@ -6,8 +6,9 @@ from typing import Optional, List
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.db import get_db
 from app.db.models import Opportunity, DeadlineAlert, AlertType, AlertStatus
@@ -22,44 +23,99 @@ from app.schemas.radar_features import (
 router = APIRouter(prefix="/deadlines", tags=["deadlines"])
 
 
+# Alert schedules: (type, days before deadline)
+ALERT_SCHEDULE = (
+    (AlertType.D7, 7),
+    (AlertType.D3, 3),
+    (AlertType.D1, 1),
+)
+
+ALERT_INSERT_BATCH_SIZE = 2000
+
+
+def build_alert_rows(rows, now: datetime) -> List[dict]:
+    """Build D7/D3/D1 alert rows for (opportunity_id, deadline_at) pairs"""
+    return [
+        {
+            "opportunity_id": opportunity_id,
+            "alert_type": alert_type,
+            "scheduled_for": deadline_at - timedelta(days=days_before),
+            "status": AlertStatus.PENDING,
+            "channels": ["email"],
+        }
+        for opportunity_id, deadline_at in rows
+        if deadline_at
+        for alert_type, days_before in ALERT_SCHEDULE
+        # Only create if in the future
+        if deadline_at - timedelta(days=days_before) > now
+    ]
+
+
+def insert_deadline_alerts(db: Session, values: List[dict]) -> int:
+    """
+    Insert alert rows in a single statement.
+    Existing (opportunity_id, alert_type) pairs are skipped by PostgreSQL.
+    Returns the number of alerts actually created.
+    """
+    created = 0
+    # Batched to stay well under PostgreSQL's 65535 bind-parameter limit
+    for i in range(0, len(values), ALERT_INSERT_BATCH_SIZE):
+        stmt = pg_insert(DeadlineAlert).values(
+            values[i:i + ALERT_INSERT_BATCH_SIZE]
+        ).on_conflict_do_nothing(
+            index_elements=["opportunity_id", "alert_type"]
+        )
+        created += db.execute(stmt).rowcount
+    return created
+
+
 def create_deadline_alerts_for_opportunity(db: Session, opportunity: Opportunity):
     """Create D7, D3, D1 alerts for an opportunity with a deadline"""
     if not opportunity.deadline_at:
         return
     
-    now = datetime.utcnow()
-    
-    # Define alert schedules
-    alert_configs = [
-        (AlertType.D7, 7),
-        (AlertType.D3, 3),
-        (AlertType.D1, 1),
-    ]
-    
-    for alert_type, days_before in alert_configs:
-        scheduled_for = opportunity.deadline_at - timedelta(days=days_before)
-        
-        # Only create if in the future
-        if scheduled_for > now:
-            # Check if alert already exists
-            existing = db.query(DeadlineAlert).filter(
-                DeadlineAlert.opportunity_id == opportunity.id,
-                DeadlineAlert.alert_type == alert_type
-            ).first()
-            
-            if not existing:
-                alert = DeadlineAlert(
-                    opportunity_id=opportunity.id,
-                    alert_type=alert_type,
-                    scheduled_for=scheduled_for,
-                    status=AlertStatus.PENDING,
-                    channels=["email"],
-                )
-                db.add(alert)
-    
+    values = build_alert_rows(
+        [(opportunity.id, opportunity.deadline_at)], datetime.utcnow()
+    )
+    insert_deadline_alerts(db, values)
     db.commit()
 
 
+def _alerts_with_opportunity_query(db: Session):
+    """
+    Alerts joined with their opportunity in a single round-trip.
+    Only the opportunity columns used in responses are loaded.
+    """
+    return db.query(DeadlineAlert).join(
+        Opportunity, DeadlineAlert.opportunity_id == Opportunity.id
+    ).options(
+        contains_eager(DeadlineAlert.opportunity).load_only(
+            Opportunity.id,
+            Opportunity.title,
+            Opportunity.organization,
+            Opportunity.deadline_at,
+        )
+    )
+
+
+def _build_alert_responses(alerts: List[DeadlineAlert]) -> List[DeadlineAlertResponse]:
+    """Build API responses from alerts with an eagerly-loaded opportunity"""
+    return [
+        DeadlineAlertResponse(
+            id=alert.id,
+            opportunity_id=alert.opportunity_id,
+            opportunity_title=alert.opportunity.title,
+            organization=alert.opportunity.organization,
+            alert_type=alert.alert_type.value,
+            scheduled_for=alert.scheduled_for,
+            deadline_at=alert.opportunity.deadline_at,
+            status=alert.status.value,
+            sent_at=alert.sent_at,
+        )
+        for alert in alerts
+    ]
+
+
 @router.get("/upcoming", response_model=UpcomingDeadlinesResponse)
 def get_upcoming_deadlines(
     days_ahead: int = Query(default=14, ge=1, le=60),
@@ -72,7 +128,7 @@ def get_upcoming_deadlines(
     now = datetime.utcnow()
     future_limit = now + timedelta(days=days_ahead)
     
-    query = db.query(DeadlineAlert).filter(
+    query = _alerts_with_opportunity_query(db).filter(
         DeadlineAlert.scheduled_for >= now,
         DeadlineAlert.scheduled_for <= future_limit,
     )
@@ -86,29 +142,7 @@ def get_upcoming_deadlines(
     
     alerts = query.order_by(DeadlineAlert.scheduled_for.asc()).limit(limit).all()
     
-    # Fetch opportunity details
-    opportunity_ids = [a.opportunity_id for a in alerts]
-    opportunities = {
-        o.id: o for o in db.query(Opportunity).filter(
-            Opportunity.id.in_(opportunity_ids)
-        ).all()
-    }
-    
-    alert_responses = []
-    for alert in alerts:
-        opp = opportunities.get(alert.opportunity_id)
-        if opp:
-            alert_responses.append(DeadlineAlertResponse(
-                id=alert.id,
-                opportunity_id=alert.opportunity_id,
-                opportunity_title=opp.title,
-                organization=opp.organization,
-                alert_type=alert.alert_type.value,
-                scheduled_for=alert.scheduled_for,
-                deadline_at=opp.deadline_at,
-                status=alert.status.value,
-                sent_at=alert.sent_at,
-            ))
+    alert_responses = _build_alert_responses(alerts)
     
     return UpcomingDeadlinesResponse(
         alerts=alert_responses,
@@ -127,34 +161,12 @@ def get_past_deadline_alerts(
     now = datetime.utcnow()
     past_limit = now - timedelta(days=days_back)
     
-    alerts = db.query(DeadlineAlert).filter(
+    alerts = _alerts_with_opportunity_query(db).filter(
         DeadlineAlert.scheduled_for >= past_limit,
         DeadlineAlert.scheduled_for < now,
     ).order_by(DeadlineAlert.scheduled_for.desc()).limit(limit).all()
     
-    # Fetch opportunity details
-    opportunity_ids = [a.opportunity_id for a in alerts]
-    opportunities = {
-        o.id: o for o in db.query(Opportunity).filter(
-            Opportunity.id.in_(opportunity_ids)
-        ).all()
-    }
-    
-    alert_responses = []
-    for alert in alerts:
-        opp = opportunities.get(alert.opportunity_id)
-        if opp:
-            alert_responses.append(DeadlineAlertResponse(
-                id=alert.id,
-                opportunity_id=alert.opportunity_id,
-                opportunity_title=opp.title,
-                organization=opp.organization,
-                alert_type=alert.alert_type.value,
-                scheduled_for=alert.scheduled_for,
-                deadline_at=opp.deadline_at,
-                status=alert.status.value,
-                sent_at=alert.sent_at,
-            ))
+    alert_responses = _build_alert_responses(alerts)
     
     return UpcomingDeadlinesResponse(
         alerts=alert_responses,
@@ -215,29 +227,16 @@ def schedule_all_deadline_alerts(
     # Get opportunities with deadlines in the future
     now = datetime.utcnow()
     
-    opportunities = db.query(Opportunity).filter(
+    rows = db.query(Opportunity.id, Opportunity.deadline_at).filter(
         Opportunity.deadline_at > now,
         Opportunity.status.notin_(["ARCHIVED", "LOST", "WON"]),
     ).all()
     
-    created_count = 0
-    for opp in opportunities:
-        # Count before
-        before = db.query(DeadlineAlert).filter(
-            DeadlineAlert.opportunity_id == opp.id
-        ).count()
-        
-        create_deadline_alerts_for_opportunity(db, opp)
-        
-        # Count after
-        after = db.query(DeadlineAlert).filter(
-            DeadlineAlert.opportunity_id == opp.id
-        ).count()
-        
-        created_count += (after - before)
+    created_count = insert_deadline_alerts(db, build_alert_rows(rows, now))
+    db.commit()
     
     return {
-        "opportunities_processed": len(opportunities),
+        "opportunities_processed": len(rows),
         "alerts_created": created_count,
     }
 
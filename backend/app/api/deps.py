@@ -1,25 +1,121 @@
 """
 Authentication dependencies
 """
+import logging
+import operator
+import threading
+from dataclasses import dataclass
+from functools import lru_cache, reduce
 from typing import Optional
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from app.db import get_db
 from app.db.models.user import User, Role
-from app.core.security import verify_token
+from app.core.cache import redis_client
+from app.core.security import verify_access_token_cached
+from app.core.rate_limit import hit
+
+logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
-    token = credentials.credentials
-    user_id = verify_token(token, "access")
+# Auth-relevant user columns, cached per process so the hot path skips
+# the users SELECT. Each entry remembers the user's auth version from
+# Redis; forget_user() bumps that version so every worker drops its copy
+# on the next request.
+USER_CACHE_TTL = 60  # seconds
+_user_cache: TTLCache = TTLCache(maxsize=5000, ttl=USER_CACHE_TTL)
+_user_cache_lock = threading.Lock()
+
+
+# Role bits for permission checks; superusers carry the extra bit, which
+# every checker's mask includes
+ROLE_BITS = {
+    Role.ADMIN: 1,
+    Role.BIZDEV: 2,
+    Role.PM: 4,
+    Role.VIEWER: 8,
+}
+SUPERUSER_BIT = 16
+
+
+def role_mask(role: Role, is_superuser: bool) -> int:
+    """Permission bitmask for a user's role and superuser flag"""
+    return ROLE_BITS.get(role, 0) | (SUPERUSER_BIT if is_superuser else 0)
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Authenticated user as seen by route dependencies"""
+    id: int
+    role: Role
+    is_active: bool
+    is_superuser: bool
+    role_mask: int
+
+
+def _user_version_key(user_id: int) -> str:
+    return f"user:{user_id}:authver"
+
+
+def _user_version(user_id: int) -> Optional[str]:
+    """Current auth version of a user, "" if never bumped, None if Redis is down"""
+    try:
+        return redis_client.get(_user_version_key(user_id)) or ""
+    except Exception:
+        return None
+
+
+def forget_user(user_id) -> None:
+    """Drop a user from the auth cache of every worker after a role/status change"""
+    user_id = int(user_id)
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+    
+    try:
+        redis_client.incr(_user_version_key(user_id))
+    except Exception as e:
+        logger.warning(f"Auth cache invalidation failed for user {user_id}: {e}")
+
+
+def _load_user(user_id: int, db: Session) -> Optional[CurrentUser]:
+    # Read the version before the SELECT so a concurrent bump can't be
+    # masked by the row we're about to cache
+    version = _user_version(user_id)
+    
+    with _user_cache_lock:
+        cached = _user_cache.get(user_id)
+    # Without Redis we can't see other workers' invalidations: go to the DB
+    if cached is not None and version is not None and cached[1] == version:
+        return cached[0]
+    
+    row = db.query(
+        User.id, User.role, User.is_active, User.is_superuser
+    ).filter(User.id == user_id).first()
+    if row is None:
+        return None
+    
+    user = CurrentUser(
+        id=row.id,
+        role=row.role,
+        is_active=bool(row.is_active),
+        is_superuser=bool(row.is_superuser),
+        role_mask=role_mask(row.role, bool(row.is_superuser)),
+    )
+    if version is not None:
+        with _user_cache_lock:
+            _user_cache[user_id] = (user, version)
+    return user
+
+
+def _authenticate(token: str, db: Session) -> CurrentUser:
+    """Verify the access token and load its user (blocking)"""
+    user_id = verify_access_token_cached(token)
     
     if user_id is None:
         raise HTTPException(
@@ -28,7 +124,7 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = _load_user(int(user_id), db)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -44,15 +140,34 @@ def get_current_user(
     return user
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user),
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> CurrentUser:
+    """Get current authenticated user"""
+    # JWT check + DB lookup in one threadpool hop; the lightweight
+    # dependencies stacked on top stay on the event loop
+    return await run_in_threadpool(_authenticate, credentials.credentials, db)
+
+
+def get_current_user_record(
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ) -> User:
-    """Get current active user"""
-    if not current_user.is_active:
+    """Get the full User row, for endpoints that read or modify profile fields"""
+    user = db.get(User, current_user.id)
+    if user is None:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Inactive user",
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
         )
+    return user
+
+
+async def get_current_active_user(
+    current_user: User = Depends(get_current_user),
+) -> User:
+    """Get current active user (get_current_user already rejects inactive users)"""
     return current_user
 
 
@@ -60,12 +175,20 @@ class RoleChecker:
     """Role-based access control dependency"""
     
     def __init__(self, allowed_roles: list[Role]):
-        self.allowed_roles = allowed_roles
+        self.allowed_mask = reduce(
+            operator.or_, (ROLE_BITS[r] for r in allowed_roles), SUPERUSER_BIT
+        )
     
-    def __call__(self, user: User = Depends(get_current_user)) -> User:
-        if user.is_superuser:
-            return user
-        if user.role not in self.allowed_roles:
+    # Equal checkers hash alike so FastAPI's per-request dependency cache
+    # resolves them once
+    def __hash__(self) -> int:
+        return hash(self.allowed_mask)
+    
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RoleChecker) and self.allowed_mask == other.allowed_mask
+    
+    async def __call__(self, user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
+        if not user.role_mask & self.allowed_mask:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Insufficient permissions",
@@ -73,14 +196,38 @@ class RoleChecker:
         return user
 
 
+class RateLimiter:
+    """Per-user rate limit dependency (shared across workers via Redis)"""
+    
+    def __init__(self, scope: str, limit: int, window: int = 60):
+        self.scope = scope
+        self.limit = limit
+        self.window = window
+    
+    def __call__(self, user: User = Depends(get_current_user)) -> User:
+        if not hit(f"{self.scope}:{user.id}", self.limit, self.window):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please retry later",
+                headers={"Retry-After": str(self.window)},
+            )
+        return user
+
+
+@lru_cache(maxsize=None)
+def role_checker(*roles: Role) -> RoleChecker:
+    """Shared RoleChecker instance for a set of roles"""
+    return RoleChecker(list(roles))
+
+
 # Pre-configured role checkers
-require_admin = RoleChecker([Role.ADMIN])
-require_bizdev = RoleChecker([Role.ADMIN, Role.BIZDEV])
-require_pm = RoleChecker([Role.ADMIN, Role.BIZDEV, Role.PM])
-require_viewer = RoleChecker([Role.ADMIN, Role.BIZDEV, Role.PM, Role.VIEWER])
+require_admin = role_checker(Role.ADMIN)
+require_bizdev = role_checker(Role.ADMIN, Role.BIZDEV)
+require_pm = role_checker(Role.ADMIN, Role.BIZDEV, Role.PM)
+require_viewer = role_checker(Role.ADMIN, Role.BIZDEV, Role.PM, Role.VIEWER)
 
 
-def get_current_admin_user(
+async def get_current_admin_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
     """Get current user only if admin or superuser"""
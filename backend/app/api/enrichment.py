@@ -3,8 +3,10 @@ API Endpoints for Artist Enrichment
 Uses Viberate web scraping for social stats
 """
 import logging
+import time
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.db import get_db
@@ -23,23 +25,35 @@ from app.enrichment.models import (
 router = APIRouter(prefix="/enrichment", tags=["enrichment"])
 logger = logging.getLogger(__name__)
 
-# Initialize service (singleton) - using Viberate scraping
-enrichment_config = EnrichmentConfig(
-    viberate_enabled=getattr(settings, 'viberate_enabled', True),
-    viberate_request_delay=getattr(settings, 'viberate_request_delay', 1.5)
-)
 
-enrichment_service = ArtistEnrichmentService(
-    config=enrichment_config,
-    spotify_client_id=settings.spotify_client_id,
-    spotify_client_secret=settings.spotify_client_secret
-)
+def create_enrichment_service() -> ArtistEnrichmentService:
+    """Build the enrichment service (called once per worker at startup)"""
+    enrichment_config = EnrichmentConfig(
+        viberate_enabled=getattr(settings, 'viberate_enabled', True),
+        viberate_request_delay=getattr(settings, 'viberate_request_delay', 1.5)
+    )
+    return ArtistEnrichmentService(
+        config=enrichment_config,
+        spotify_client_id=settings.spotify_client_id,
+        spotify_client_secret=settings.spotify_client_secret
+    )
+
+
+def get_enrichment_service(request: Request) -> ArtistEnrichmentService:
+    """Worker-wide enrichment service, created in the app startup hook"""
+    return request.app.state.enrichment
+
+
+# Metrics snapshot reused across scrapes within this window
+METRICS_CACHE_TTL = 1.0  # seconds
+_metrics_cache = {"t": 0.0, "v": None}
 
 
 @router.post("/artists/enrich", response_model=EnrichedArtistData)
 async def enrich_artist(
     request: EnrichmentRequest,
     current_user: User = Depends(get_current_user),
+    enrichment_service: ArtistEnrichmentService = Depends(get_enrichment_service),
     db: Session = Depends(get_db)
 ):
     """
@@ -73,7 +87,8 @@ async def enrich_artist(
 async def get_enriched_artist(
     artist_id: str,
     refresh: bool = Query(False, description="Force refresh from sources"),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    enrichment_service: ArtistEnrichmentService = Depends(get_enrichment_service)
 ):
     """
     Get enriched artist data (with optional refresh)
@@ -93,7 +108,8 @@ async def get_enriched_artist(
 @router.post("/artists/{artist_id}/refresh", response_model=EnrichedArtistData)
 async def refresh_artist(
     artist_id: str,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    enrichment_service: ArtistEnrichmentService = Depends(get_enrichment_service)
 ):
     """
     Force refresh artist data (bypasses cache)
@@ -114,7 +130,8 @@ async def refresh_artist(
 async def enrich_artists_batch(
     request: BatchEnrichmentRequest,
     background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    enrichment_service: ArtistEnrichmentService = Depends(get_enrichment_service)
 ):
     """
     Enrich multiple artists in batch
@@ -129,9 +146,21 @@ async def enrich_artists_batch(
     if len(request.artist_ids) > 50:
         raise HTTPException(400, "Maximum 50 artists per batch")
     
+    # Normalize IDs/URLs and drop duplicates before any provider is hit
+    artist_ids = []
+    invalid = []
+    for artist_input in request.artist_ids:
+        try:
+            artist_ids.append(enrichment_service._extract_spotify_id(artist_input.strip()))
+        except ValueError:
+            invalid.append(artist_input)
+    if invalid:
+        raise HTTPException(400, f"Invalid Spotify artist IDs: {', '.join(invalid[:5])}")
+    artist_ids = list(dict.fromkeys(artist_ids))
+    
     try:
         results = await enrichment_service.enrich_batch(
-            request.artist_ids,
+            artist_ids,
             request.force_refresh
         )
         return results
@@ -142,7 +171,8 @@ async def enrich_artists_batch(
 
 @router.get("/metrics")
 async def get_enrichment_metrics(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    enrichment_service: ArtistEnrichmentService = Depends(get_enrichment_service)
 ):
     """
     Get enrichment service metrics
@@ -155,7 +185,12 @@ async def get_enrichment_metrics(
     - Average latency
     - Circuit breaker states
     """
-    return enrichment_service.get_metrics()
+    now = time.monotonic()
+    if _metrics_cache["v"] is None or now - _metrics_cache["t"] >= METRICS_CACHE_TTL:
+        # Built off the event loop so scrape bursts can't stall other requests
+        _metrics_cache["v"] = await run_in_threadpool(enrichment_service.get_metrics)
+        _metrics_cache["t"] = now
+    return _metrics_cache["v"]
 
 
 # =====  BACKGROUND JOB ENDPOINTS (for production batch) =====
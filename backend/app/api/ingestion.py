@@ -1,29 +1,48 @@
 """
 Ingestion endpoints
 """
+import threading
 from typing import List, Optional
 from uuid import UUID
 
+from cachetools import TTLCache
+from celery import group, states
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
-from pydantic import BaseModel
-from sqlalchemy import desc
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import Integer, any_, bindparam, desc, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_db, get_async_db
 from app.db.models.user import User
 from app.db.models.ingestion import IngestionRun, IngestionStatus
 from app.db.models.source import SourceConfig
 from app.schemas.ingestion import IngestionRunResponse, IngestionTriggerRequest
 from app.api.deps import get_current_user, require_admin
+from app.api.sources import active_sources_cache, active_sources_cache_lock
 from app.workers.tasks import run_ingestion_task, run_intelligent_search, analyze_artist_task
 
-router = APIRouter(prefix="/ingestion", tags=["ingestion"])
+router = APIRouter(prefix="/ingestion", tags=["ingestion"], default_response_class=ORJSONResponse)
+
+# Task status snapshots; the frontend polls about once a second per task
+TASK_STATUS_CACHE_TTL = 0.5  # seconds
+_task_status_cache: TTLCache = TTLCache(maxsize=2000, ttl=TASK_STATUS_CACHE_TTL)
+_task_status_cache_lock = threading.Lock()
 
 
 # Pydantic models for intelligent search
+# Immutable, strict request bodies: unknown fields are rejected and
+# strings arrive already stripped
+REQUEST_MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True, str_strip_whitespace=True)
+
+
 class IntelligentSearchRequest(BaseModel):
     """Request for intelligent search"""
-    query: str
+    model_config = REQUEST_MODEL_CONFIG
+    
+    query: str = Field(..., min_length=2, max_length=200)
     budget_min: Optional[float] = None
     budget_max: Optional[float] = None
     region: Optional[str] = None
@@ -33,64 +52,87 @@ class IntelligentSearchRequest(BaseModel):
 
 class ArtistAnalysisRequest(BaseModel):
     """Request for artist analysis"""
-    artist_name: str
+    model_config = REQUEST_MODEL_CONFIG
+    
+    artist_name: str = Field(..., min_length=2, max_length=200)
     force_refresh: bool = True  # Toujours mettre à jour les infos de l'artiste
 
 
 @router.get("/runs", response_model=List[IngestionRunResponse])
-def list_ingestion_runs(
-    source_id: UUID = None,
+async def list_ingestion_runs(
+    source_id: Optional[int] = None,
     status: IngestionStatus = None,
     limit: int = Query(50, ge=1, le=200),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """List ingestion runs"""
-    query = db.query(IngestionRun)
+    query = select(IngestionRun)
     
     if source_id:
-        query = query.filter(IngestionRun.source_config_id == source_id)
+        query = query.where(IngestionRun.source_config_id == source_id)
     if status:
-        query = query.filter(IngestionRun.status == status)
+        query = query.where(IngestionRun.status == status)
     
-    runs = query.order_by(desc(IngestionRun.started_at)).limit(limit).all()
-    return runs
+    result = await db.execute(query.order_by(desc(IngestionRun.started_at)).limit(limit))
+    # Validate once here and hand orjson plain dicts, instead of letting
+    # FastAPI re-validate the ORM rows and encode them with stdlib json
+    return ORJSONResponse([
+        IngestionRunResponse.model_validate(run).model_dump(mode="json")
+        for run in result.scalars().all()
+    ])
 
 
 @router.get("/runs/{run_id}", response_model=IngestionRunResponse)
-def get_ingestion_run(
+async def get_ingestion_run(
     run_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get ingestion run by ID"""
-    run = db.query(IngestionRun).filter(IngestionRun.id == run_id).first()
+    run = await db.get(IngestionRun, run_id)
     if not run:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ingestion run not found",
         )
-    return run
+    return ORJSONResponse(IngestionRunResponse.model_validate(run).model_dump(mode="json"))
 
 
 @router.post("/run")
-def trigger_ingestion(
+async def trigger_ingestion(
     request: IngestionTriggerRequest = None,
     background_tasks: BackgroundTasks = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin),
 ):
     """Trigger ingestion manually with optional search parameters"""
-    # Build list of sources to run
-    query = db.query(SourceConfig).filter(SourceConfig.is_active == True)
-    
-    if request and request.source_ids:
-        query = query.filter(SourceConfig.id.in_(request.source_ids))
+    # Build list of sources to run (cached briefly, the set rarely changes)
+    source_ids = sorted(set(request.source_ids)) if request and request.source_ids else []
+    source_types = sorted(set(request.source_types)) if request and request.source_types else []
+    cache_key = (tuple(source_ids), tuple(source_types))
     
-    if request and request.source_types:
-        query = query.filter(SourceConfig.source_type.in_(request.source_types))
+    with active_sources_cache_lock:
+        sources = active_sources_cache.get(cache_key)
     
-    sources = query.all()
+    if sources is None:
+        query = select(SourceConfig.id, SourceConfig.name).where(SourceConfig.is_active == True)
+        
+        if source_ids:
+            # Bound as a single int[] parameter: the SQL text doesn't change with
+            # the list size, so asyncpg reuses its prepared statement
+            query = query.where(
+                SourceConfig.id == any_(bindparam("source_ids", source_ids, type_=ARRAY(Integer)))
+            )
+        
+        if source_types:
+            query = query.where(SourceConfig.source_type.in_(source_types))
+        
+        rows = (await db.execute(query.order_by(SourceConfig.id))).all()
+        sources = [{"id": row.id, "name": row.name} for row in rows]
+        
+        with active_sources_cache_lock:
+            active_sources_cache[cache_key] = sources
     
     if not sources:
         return {
@@ -103,21 +145,13 @@ def trigger_ingestion(
     # Extract search params if provided
     search_params = None
     if request and request.search_params:
-        search_params = {
-            "keywords": request.search_params.keywords,
-            "region": request.search_params.region,
-            "city": request.search_params.city,
-            "budget_min": request.search_params.budget_min,
-            "budget_max": request.search_params.budget_max,
-        }
-        # Remove None values
-        search_params = {k: v for k, v in search_params.items() if v is not None}
+        search_params = request.search_params.model_dump(exclude_none=True)
     
-    # Queue ingestion tasks with search params
-    task_ids = []
-    for source in sources:
-        task = run_ingestion_task.delay(str(source.id), search_params)
-        task_ids.append(task.id)
+    # Queue all ingestion tasks in one broker round-trip
+    job = group(
+        run_ingestion_task.s(str(source["id"]), search_params) for source in sources
+    ).apply_async()
+    task_ids = [result.id for result in job.results]
     
     return {
         "message": f"Ingestion triggered for {len(sources)} sources",
@@ -128,13 +162,13 @@ def trigger_ingestion(
 
 
 @router.post("/run/{source_id}")
-def trigger_source_ingestion(
-    source_id: UUID,
-    db: Session = Depends(get_db),
+async def trigger_source_ingestion(
+    source_id: int,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_admin),
 ):
     """Trigger ingestion for a specific source"""
-    source = db.query(SourceConfig).filter(SourceConfig.id == source_id).first()
+    source = await db.get(SourceConfig, source_id)
     if not source:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -168,27 +202,22 @@ def trigger_intelligent_search(
     - Artist information (fees, events, trends)
     - Opportunity scoring
     """
-    if not request.query or len(request.query.strip()) < 2:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Query must be at least 2 characters",
+    # Build search params (budgets may be 0; empty region/city are dropped)
+    search_params = {
+        key: value
+        for key, value in (
+            ("budget_min", request.budget_min),
+            ("budget_max", request.budget_max),
+            ("region", request.region or None),
+            ("city", request.city or None),
         )
-    
-    # Build search params
-    search_params = {}
-    if request.budget_min is not None:
-        search_params["budget_min"] = request.budget_min
-    if request.budget_max is not None:
-        search_params["budget_max"] = request.budget_max
-    if request.region:
-        search_params["region"] = request.region
-    if request.city:
-        search_params["city"] = request.city
+        if value is not None
+    }
     
     # Trigger the intelligent search task
     task = run_intelligent_search.delay(
-        query=request.query.strip(),
-        search_params=search_params if search_params else None,
+        query=request.query,
+        search_params=search_params or None,
         source_ids=request.source_ids,
     )
     
@@ -214,13 +243,7 @@ def trigger_artist_analysis(
     - Finding booking contacts
     - Understanding market positioning
     """
-    if not request.artist_name or len(request.artist_name.strip()) < 2:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Artist name must be at least 2 characters",
-        )
-    
-    task = analyze_artist_task.delay(request.artist_name.strip(), request.force_refresh)
+    task = analyze_artist_task.delay(request.artist_name, request.force_refresh)
     
     return {
         "message": f"Artist analysis started for: {request.artist_name}",
@@ -236,20 +259,29 @@ def get_task_status(
     current_user: User = Depends(get_current_user),
 ):
     """Get the status and result of an async task (intelligent search, artist analysis, etc.)"""
+    with _task_status_cache_lock:
+        cached = _task_status_cache.get(task_id)
+    if cached is not None:
+        return cached
+    
     from app.workers.celery_app import celery_app
     
     result = celery_app.AsyncResult(task_id)
+    # Read the state once; the result is only fetched once the task is done
+    state = result.state
+    ready = state in states.READY_STATES
     
     response = {
         "task_id": task_id,
-        "status": result.status,
-        "ready": result.ready(),
+        "status": state,
+        "ready": ready,
     }
     
-    if result.ready():
-        if result.successful():
-            response["result"] = result.result
-        elif result.failed():
-            response["error"] = str(result.result)
+    if state == states.SUCCESS:
+        response["result"] = result.result
+    elif state == states.FAILURE:
+        response["error"] = str(result.result)
     
+    with _task_status_cache_lock:
+        _task_status_cache[task_id] = response
     return response
@@ -3,41 +3,86 @@ Opportunities endpoints
 """
 from datetime import datetime
 from decimal import Decimal
-from typing import Optional, List
+from functools import lru_cache
+from typing import Optional, List, Tuple
 from uuid import UUID
+import base64
+import json
+import logging
 import math
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import func, and_, or_, desc
-from sqlalchemy.orm import Session
+from sqlalchemy import func, and_, or_, desc, text
+from sqlalchemy.orm import Session, selectinload
 
 from app.db import get_db
 from app.db.models.user import User
 from app.db.models.opportunity import (
     Opportunity, OpportunityNote, OpportunityTask, OpportunityTag,
-    OpportunityStatus, OpportunityCategory, SourceType
+    OpportunityStatus, OpportunityCategory, SourceType, TaskStatus, SEARCH_TS_CONFIG
 )
 from app.schemas.opportunity import (
     OpportunityResponse, OpportunityListResponse, OpportunityUpdate,
+    OpportunityDetailResponse,
     NoteCreate, NoteResponse,
     TaskCreate, TaskUpdate, TaskResponse,
     BudgetStatsResponse
 )
 from app.api.deps import get_current_user, require_bizdev, require_admin
+from app.core.cache import invalidate_cache, cache_get, cache_set, get_cache_key
 
 router = APIRouter(prefix="/opportunities", tags=["opportunities"])
+logger = logging.getLogger(__name__)
 
+# Queries shorter than this also fall back to substring matching
+MIN_FULLTEXT_QUERY_LENGTH = 3
 
-@router.get("", response_model=OpportunityListResponse)
-def list_opportunities(
-    # Pagination
-    page: int = Query(1, ge=1),
-    size: int = Query(20, ge=1, le=100),
-    # Filters
+# Sortable list columns and their prebuilt ORDER BY clauses
+SORT_COLUMNS = {
+    "score": Opportunity.score,
+    "deadline_at": Opportunity.deadline_at,
+    "created_at": Opportunity.created_at,
+    "budget_amount": Opportunity.budget_amount,
+}
+OFFSET_ORDER_BY = {}
+KEYSET_ORDER_BY = {}
+for _name, _column in SORT_COLUMNS.items():
+    OFFSET_ORDER_BY[(_name, "desc")] = desc(_column)
+    OFFSET_ORDER_BY[(_name, "asc")] = _column
+    KEYSET_ORDER_BY[(_name, "desc")] = (_column.desc().nulls_last(), Opportunity.id.desc())
+    KEYSET_ORDER_BY[(_name, "asc")] = (_column.asc().nulls_last(), Opportunity.id.asc())
+
+# Derived stats/reports are cached per dataset version (see opportunities_fingerprint)
+REPORT_CACHE_TTL = 600  # seconds
+
+
+def opportunities_fingerprint(db: Session) -> str:
+    """
+    Cheap version stamp of the opportunities table: row count plus latest
+    update. Any insert, delete or ORM update changes it, so cache keys that
+    include it never serve results computed from older data.
+    """
+    count, last_update = db.query(
+        func.count(Opportunity.id), func.max(Opportunity.updated_at)
+    ).one()
+    return f"{count}:{last_update.isoformat() if last_update else 0}"
+
+
+@lru_cache(maxsize=512)
+def _parse_csv(value: Optional[str], enum_cls) -> Optional[tuple]:
+    """Parse a comma-separated query param into enum members (memoized per string)"""
+    if not value:
+        return None
+    return tuple(enum_cls(v.strip()) for v in value.split(","))
+
+
+def _apply_opportunity_filters(
+    query,
+    *,
     status: Optional[OpportunityStatus] = None,
-    statuses: Optional[str] = None,  # Comma-separated
+    status_list: Optional[Tuple[OpportunityStatus, ...]] = None,
     category: Optional[OpportunityCategory] = None,
-    categories: Optional[str] = None,  # Comma-separated
+    category_list: Optional[Tuple[OpportunityCategory, ...]] = None,
     min_score: Optional[int] = None,
     max_score: Optional[int] = None,
     region: Optional[str] = None,
@@ -51,87 +96,169 @@ def list_opportunities(
     has_budget: Optional[bool] = None,
     assigned_to_user_id: Optional[int] = None,
     created_after: Optional[datetime] = None,
-    # Sorting
-    sort_by: str = Query("score", regex="^(score|deadline_at|created_at|budget_amount)$"),
-    sort_order: str = Query("desc", regex="^(asc|desc)$"),
-    # Auth
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
 ):
-    """List opportunities with filters and pagination"""
-    query = db.query(Opportunity)
+    """Apply the opportunity list filters shared by list and stats endpoints"""
+    conditions = []
     
-    # Apply filters
     if status:
-        query = query.filter(Opportunity.status == status)
-    if statuses:
-        status_list = [OpportunityStatus(s.strip()) for s in statuses.split(",")]
-        query = query.filter(Opportunity.status.in_(status_list))
+        conditions.append(Opportunity.status == status)
+    if status_list:
+        conditions.append(Opportunity.status.in_(status_list))
     
     if category:
-        query = query.filter(Opportunity.category == category)
-    if categories:
-        cat_list = [OpportunityCategory(c.strip()) for c in categories.split(",")]
-        query = query.filter(Opportunity.category.in_(cat_list))
+        conditions.append(Opportunity.category == category)
+    if category_list:
+        conditions.append(Opportunity.category.in_(category_list))
     
     if min_score is not None:
-        query = query.filter(Opportunity.score >= min_score)
+        conditions.append(Opportunity.score >= min_score)
     if max_score is not None:
-        query = query.filter(Opportunity.score <= max_score)
+        conditions.append(Opportunity.score <= max_score)
     
     if region:
-        query = query.filter(Opportunity.location_region.ilike(f"%{region}%"))
+        conditions.append(Opportunity.location_region.ilike(f"%{region}%"))
     
     if source_name:
-        query = query.filter(Opportunity.source_name == source_name)
+        conditions.append(Opportunity.source_name == source_name)
     if source_type:
-        query = query.filter(Opportunity.source_type == source_type)
+        conditions.append(Opportunity.source_type == source_type)
     
-    if q:
-        search_term = f"%{q}%"
-        query = query.filter(
-            or_(
+    if q and q.strip():
+        q = q.strip()
+        # GIN-indexed full-text match on the generated search_tsv column
+        text_match = Opportunity.search_tsv.op("@@")(
+            func.websearch_to_tsquery(SEARCH_TS_CONFIG, q)
+        )
+        if len(q) < MIN_FULLTEXT_QUERY_LENGTH:
+            # Too short to be a useful lexeme: keep substring matching on
+            # the short columns as well
+            search_term = f"%{q}%"
+            text_match = or_(
+                text_match,
                 Opportunity.title.ilike(search_term),
-                Opportunity.description.ilike(search_term),
                 Opportunity.organization.ilike(search_term),
             )
-        )
+        conditions.append(text_match)
     
     if deadline_before:
-        query = query.filter(Opportunity.deadline_at <= deadline_before)
+        conditions.append(Opportunity.deadline_at <= deadline_before)
     if deadline_after:
-        query = query.filter(Opportunity.deadline_at >= deadline_after)
+        conditions.append(Opportunity.deadline_at >= deadline_after)
     
     if min_budget is not None:
-        query = query.filter(Opportunity.budget_amount >= min_budget)
+        conditions.append(Opportunity.budget_amount >= min_budget)
     if max_budget is not None:
-        query = query.filter(Opportunity.budget_amount <= max_budget)
+        conditions.append(Opportunity.budget_amount <= max_budget)
     
     if has_budget is not None:
         if has_budget:
-            query = query.filter(Opportunity.budget_amount.isnot(None))
+            conditions.append(Opportunity.budget_amount.isnot(None))
         else:
-            query = query.filter(Opportunity.budget_amount.is_(None))
+            conditions.append(Opportunity.budget_amount.is_(None))
     
     if assigned_to_user_id:
-        query = query.filter(Opportunity.assigned_to_user_id == assigned_to_user_id)
+        conditions.append(Opportunity.assigned_to_user_id == assigned_to_user_id)
     
     if created_after:
-        query = query.filter(Opportunity.created_at >= created_after)
+        conditions.append(Opportunity.created_at >= created_after)
+    
+    # One filter() call for the whole set
+    return query.filter(*conditions) if conditions else query
+
+
+@router.get("", response_model=OpportunityListResponse)
+def list_opportunities(
+    # Pagination
+    page: int = Query(1, ge=1, description="Offset pagination (deprecated, use cursor)"),
+    size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous next_cursor; empty for the first page"),
+    include_total: bool = Query(False, description="Also count matches in cursor mode"),
+    # Filters
+    status: Optional[OpportunityStatus] = None,
+    statuses: Optional[str] = None,  # Comma-separated
+    category: Optional[OpportunityCategory] = None,
+    categories: Optional[str] = None,  # Comma-separated
+    min_score: Optional[int] = None,
+    max_score: Optional[int] = None,
+    region: Optional[str] = None,
+    source_name: Optional[str] = None,
+    source_type: Optional[SourceType] = None,
+    q: Optional[str] = None,
+    deadline_before: Optional[datetime] = None,
+    deadline_after: Optional[datetime] = None,
+    min_budget: Optional[Decimal] = None,
+    max_budget: Optional[Decimal] = None,
+    has_budget: Optional[bool] = None,
+    assigned_to_user_id: Optional[int] = None,
+    created_after: Optional[datetime] = None,
+    # Sorting
+    sort_by: str = Query("score", regex="^(score|deadline_at|created_at|budget_amount)$"),
+    sort_order: str = Query("desc", regex="^(asc|desc)$"),
+    # Auth
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """List opportunities with filters and pagination"""
+    query = _apply_opportunity_filters(
+        db.query(Opportunity),
+        status=status,
+        status_list=_parse_csv(statuses, OpportunityStatus),
+        category=category,
+        category_list=_parse_csv(categories, OpportunityCategory),
+        min_score=min_score,
+        max_score=max_score,
+        region=region,
+        source_name=source_name,
+        source_type=source_type,
+        q=q,
+        deadline_before=deadline_before,
+        deadline_after=deadline_after,
+        min_budget=min_budget,
+        max_budget=max_budget,
+        has_budget=has_budget,
+        assigned_to_user_id=assigned_to_user_id,
+        created_after=created_after,
+    )
     
-    # Count total
-    total = query.count()
+    sort_column = SORT_COLUMNS[sort_by]
+    
+    if cursor is not None:
+        # Keyset mode: one range scan per page, no OFFSET, COUNT only on request
+        total = query.count() if include_total else None
+        page_query = _apply_keyset(query, sort_column, sort_order, cursor)
+        rows = page_query.limit(size + 1).all()
+        items = rows[:size]
+        next_cursor = (
+            _encode_cursor(getattr(items[-1], sort_by), items[-1].id)
+            if len(rows) > size else None
+        )
+        return OpportunityListResponse(
+            items=items,
+            total=total,
+            page=page,
+            size=size,
+            pages=math.ceil(total / size) if total is not None else None,
+            next_cursor=next_cursor,
+        )
     
     # Apply sorting
-    sort_column = getattr(Opportunity, sort_by)
-    if sort_order == "desc":
-        query = query.order_by(desc(sort_column))
-    else:
-        query = query.order_by(sort_column)
+    query = query.order_by(OFFSET_ORDER_BY[(sort_by, sort_order)])
     
-    # Apply pagination
+    # Apply pagination; the total rides along as a window aggregate so the
+    # page and the count come from one scan
     offset = (page - 1) * size
-    items = query.offset(offset).limit(size).all()
+    rows = (
+        query.add_columns(func.count().over().label("total"))
+        .offset(offset)
+        .limit(size)
+        .all()
+    )
+    items = [row[0] for row in rows]
+    if rows:
+        total = rows[0].total
+    else:
+        # Past the last page the window has no row to report on
+        total = query.order_by(None).count() if offset else 0
     
     return OpportunityListResponse(
         items=items,
@@ -142,6 +269,62 @@ def list_opportunities(
     )
 
 
+def _encode_cursor(sort_value, opportunity_id: int) -> str:
+    """Opaque cursor for the row a page ended on"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    elif isinstance(sort_value, Decimal):
+        sort_value = str(sort_value)
+    raw = json.dumps([sort_value, opportunity_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str, sort_by: str):
+    try:
+        sort_value, opportunity_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if sort_value is not None:
+            if sort_by in ("deadline_at", "created_at"):
+                sort_value = datetime.fromisoformat(sort_value)
+            elif sort_by == "budget_amount":
+                sort_value = Decimal(sort_value)
+            else:
+                sort_value = int(sort_value)
+        return sort_value, int(opportunity_id)
+    except (ValueError, TypeError, ArithmeticError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _apply_keyset(query, sort_column, sort_order: str, cursor: str):
+    """
+    Order by (sort_column, id) with NULL sort values last, and start
+    after the cursor row (an empty cursor string means the first page).
+    """
+    descending = sort_order == "desc"
+    id_column = Opportunity.id
+    query = query.order_by(*KEYSET_ORDER_BY[(sort_column.key, sort_order)])
+    
+    if not cursor:
+        return query
+    
+    sort_value, last_id = _decode_cursor(cursor, sort_column.key)
+    after_id = id_column < last_id if descending else id_column > last_id
+    if sort_value is None:
+        # Already into the NULL tail: only the id tiebreaker is left
+        return query.filter(sort_column.is_(None), after_id)
+    
+    after_value = sort_column < sort_value if descending else sort_column > sort_value
+    return query.filter(
+        or_(
+            after_value,
+            and_(sort_column == sort_value, after_id),
+            sort_column.is_(None),
+        )
+    )
+
+
 @router.get("/budget-stats", response_model=BudgetStatsResponse)
 def get_budget_stats(
     bins: int = Query(15, ge=5, le=30),
@@ -154,43 +337,44 @@ def get_budget_stats(
     current_user: User = Depends(get_current_user),
 ):
     """Get budget statistics for histogram filter"""
-    query = db.query(Opportunity).filter(Opportunity.budget_amount.isnot(None))
-    
-    # Apply same filters
-    if status:
-        query = query.filter(Opportunity.status == status)
-    if statuses:
-        status_list = [OpportunityStatus(s.strip()) for s in statuses.split(",")]
-        query = query.filter(Opportunity.status.in_(status_list))
-    if category:
-        query = query.filter(Opportunity.category == category)
-    if region:
-        query = query.filter(Opportunity.location_region.ilike(f"%{region}%"))
-    
-    # Get stats
-    stats = db.query(
-        func.min(Opportunity.budget_amount).label("min_budget"),
-        func.max(Opportunity.budget_amount).label("max_budget"),
-        func.avg(Opportunity.budget_amount).label("avg_budget"),
-        func.count(Opportunity.id).label("count"),
-    ).filter(Opportunity.budget_amount.isnot(None))
+    filters = dict(
+        status=status,
+        status_list=_parse_csv(statuses, OpportunityStatus),
+        category=category,
+        region=region,
+    )
     
-    # Apply same filters
-    if status:
-        stats = stats.filter(Opportunity.status == status)
-    if statuses:
-        stats = stats.filter(Opportunity.status.in_(status_list))
-    if category:
-        stats = stats.filter(Opportunity.category == category)
-    if region:
-        stats = stats.filter(Opportunity.location_region.ilike(f"%{region}%"))
+    cache_key = (
+        f"opportunities:budget_stats:{get_cache_key(bins, **filters)}:"
+        f"{opportunities_fingerprint(db)}"
+    )
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return BudgetStatsResponse(**cached)
     
-    result = stats.first()
+    response = _compute_budget_stats(db, bins, filters)
+    cache_set(cache_key, response.model_dump(mode="json"), ttl=REPORT_CACHE_TTL)
+    return response
+
+
+def _compute_budget_stats(db: Session, bins: int, filters: dict) -> BudgetStatsResponse:
+    # Budget stats and the total (same filters, budget or not) in one pass;
+    # aggregates over budget_amount already skip NULLs
+    result = _apply_opportunity_filters(
+        db.query(
+            func.min(Opportunity.budget_amount).label("min_budget"),
+            func.max(Opportunity.budget_amount).label("max_budget"),
+            func.avg(Opportunity.budget_amount).label("avg_budget"),
+            func.count(Opportunity.budget_amount).label("count"),
+            func.count(Opportunity.id).label("total_count"),
+        ),
+        **filters,
+    ).first()
+    total_count = result.total_count if result else 0
     
-    total_query = db.query(func.count(Opportunity.id))
-    if status:
-        total_query = total_query.filter(Opportunity.status == status)
-    total_count = total_query.scalar()
+    query = _apply_opportunity_filters(
+        db.query(Opportunity), has_budget=True, **filters
+    )
     
     if not result or result.count == 0:
         return BudgetStatsResponse(
@@ -205,26 +389,23 @@ def get_budget_stats(
     min_val = float(result.min_budget)
     max_val = float(result.max_budget)
     
-    # Build histogram
+    # Build histogram: one GROUP BY over width_bucket instead of a COUNT per bin.
+    # width_bucket puts max_val itself in bucket bins+1, so clamp it into the
+    # last bin (which is inclusive of the max, as before).
     histogram = []
     if max_val > min_val:
         bin_width = (max_val - min_val) / bins
+        bucket = func.least(
+            func.width_bucket(Opportunity.budget_amount, min_val, max_val, bins), bins
+        ).label("bucket")
+        bucket_counts = dict(
+            query.with_entities(bucket, func.count()).group_by(bucket).all()
+        )
         for i in range(bins):
-            bin_min = min_val + (i * bin_width)
-            bin_max = min_val + ((i + 1) * bin_width)
-            
-            count_query = query.filter(
-                and_(
-                    Opportunity.budget_amount >= bin_min,
-                    Opportunity.budget_amount < bin_max if i < bins - 1 else Opportunity.budget_amount <= bin_max
-                )
-            )
-            count = count_query.count()
-            
             histogram.append({
-                "min": round(bin_min, 2),
-                "max": round(bin_max, 2),
-                "count": count,
+                "min": round(min_val + (i * bin_width), 2),
+                "max": round(min_val + ((i + 1) * bin_width), 2),
+                "count": bucket_counts.get(i + 1, 0),
             })
     else:
         # All same value
@@ -260,6 +441,33 @@ def get_opportunity(
     return opportunity
 
 
+@router.get("/{opportunity_id}/detail", response_model=OpportunityDetailResponse)
+def get_opportunity_detail(
+    opportunity_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get an opportunity with its notes and tasks in one response
+    (replaces the opportunity + /notes + /tasks sequence on the detail view)
+    """
+    opportunity = db.query(Opportunity).options(
+        selectinload(Opportunity.notes),
+        selectinload(Opportunity.tasks),
+    ).filter(Opportunity.id == opportunity_id).first()
+    if not opportunity:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Opportunity not found",
+        )
+    
+    detail = OpportunityDetailResponse.model_validate(opportunity)
+    # Same ordering as the /notes and /tasks endpoints
+    detail.notes.sort(key=lambda n: n.created_at, reverse=True)
+    detail.tasks.sort(key=lambda t: (t.due_date is None, t.due_date or datetime.min))
+    return detail
+
+
 @router.patch("/{opportunity_id}", response_model=OpportunityResponse)
 def update_opportunity(
     opportunity_id: int,
@@ -281,9 +489,35 @@ def update_opportunity(
     
     db.commit()
     db.refresh(opportunity)
+    
+    # Dashboard stats and top lists are cached globally
+    invalidate_cache("dashboard")
+    
     return opportunity
 
 
+MERGE_URLS_SQL = text("""
+    UPDATE opportunities AS t
+    SET urls_all = (
+        SELECT coalesce(json_agg(DISTINCT u.url), '[]'::json)
+        FROM (
+            SELECT json_array_elements_text(
+                CASE WHEN json_typeof(t.urls_all) = 'array' THEN t.urls_all ELSE '[]'::json END
+            ) AS url
+            UNION
+            SELECT json_array_elements_text(
+                CASE WHEN json_typeof(s.urls_all) = 'array' THEN s.urls_all ELSE '[]'::json END
+            )
+            UNION
+            SELECT s.url_primary
+        ) AS u
+        WHERE u.url IS NOT NULL
+    )
+    FROM opportunities AS s
+    WHERE t.id = :target_id AND s.id = :source_id
+""")
+
+
 @router.post("/{opportunity_id}/merge")
 def merge_opportunities(
     opportunity_id: int,
@@ -292,8 +526,23 @@ def merge_opportunities(
     current_user: User = Depends(require_admin),
 ):
     """Merge duplicate opportunity into another"""
-    source = db.query(Opportunity).filter(Opportunity.id == opportunity_id).first()
-    target = db.query(Opportunity).filter(Opportunity.id == merge_into_id).first()
+    if opportunity_id == merge_into_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot merge opportunity into itself",
+        )
+    
+    # Lock both rows (in id order, so opposite merges can't deadlock) until commit
+    locked = {
+        opp.id: opp
+        for opp in db.query(Opportunity)
+        .filter(Opportunity.id.in_([opportunity_id, merge_into_id]))
+        .order_by(Opportunity.id)
+        .with_for_update()
+        .all()
+    }
+    source = locked.get(opportunity_id)
+    target = locked.get(merge_into_id)
     
     if not source or not target:
         raise HTTPException(
@@ -301,33 +550,29 @@ def merge_opportunities(
             detail="One or both opportunities not found",
         )
     
-    if source.id == target.id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot merge opportunity into itself",
-        )
-    
     # Move notes and tasks
-    db.query(OpportunityNote).filter(
+    notes_moved = db.query(OpportunityNote).filter(
         OpportunityNote.opportunity_id == source.id
     ).update({"opportunity_id": target.id})
     
-    db.query(OpportunityTask).filter(
+    tasks_moved = db.query(OpportunityTask).filter(
         OpportunityTask.opportunity_id == source.id
     ).update({"opportunity_id": target.id})
     
-    # Merge URLs
-    all_urls = set(target.urls_all or [])
-    all_urls.update(source.urls_all or [])
-    if source.url_primary:
-        all_urls.add(source.url_primary)
-    target.urls_all = list(all_urls)
+    # Merge URLs in the database (distinct union of both lists + source's primary URL)
+    db.execute(MERGE_URLS_SQL, {"target_id": target.id, "source_id": source.id})
+    db.expire(target, ["urls_all"])
     
     # Mark source as duplicate
     source.status = OpportunityStatus.ARCHIVED
     source.duplicate_of_id = target.id
     
     db.commit()
+    invalidate_cache("dashboard")
+    logger.info(
+        f"Merged opportunity {source.id} into {target.id} "
+        f"({notes_moved} notes, {tasks_moved} tasks moved)"
+    )
     
     return {"message": "Opportunities merged successfully", "target_id": str(target.id)}
 
@@ -438,9 +683,10 @@ def update_task(
     for field, value in update_dict.items():
         setattr(task, field, value)
     
-    # Set completed_at if status changed to DONE
-    if task_data.status == "DONE" and task.completed_at is None:
-        task.completed_at = datetime.utcnow()
+    # Set completed_at if status changed to DONE; stamped by the database
+    # in UTC like the other (naive, utcnow) timestamps, read back by refresh()
+    if task_data.status == TaskStatus.DONE and task.completed_at is None:
+        task.completed_at = func.timezone("utc", func.now())
     
     db.commit()
     db.refresh(task)
@@ -2,10 +2,13 @@
 API endpoints for predictions and weekly reports.
 """
 
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from pydantic import BaseModel
 
 from ..api.deps import get_current_user, get_db
@@ -13,10 +16,83 @@ from ..db.models.user import User
 from ..db.models.opportunity import Opportunity
 from ..intelligence.predictions import predictions_engine, PredictionResult
 from ..intelligence.weekly_report import weekly_report_generator
+from ..core.cache import cache_get, cache_set
+from .opportunities import opportunities_fingerprint, REPORT_CACHE_TTL
 
 
 router = APIRouter(prefix="/predictions", tags=["predictions"])
 
+# Rows fetched per round trip when streaming whole-table reports
+REPORT_YIELD_PER = 1000
+
+# batch_predict limits
+MAX_BATCH_PREDICT = 500
+BATCH_PREDICT_CHUNK = 32
+
+# Columns the weekly report reads
+REPORT_COLUMNS = (
+    Opportunity.id,
+    Opportunity.title,
+    Opportunity.description,
+    Opportunity.organization,
+    Opportunity.score,
+    Opportunity.status,
+    Opportunity.budget_amount,
+    Opportunity.deadline_at,
+    Opportunity.source_type,
+    Opportunity.contact_email,
+    Opportunity.created_at,
+    Opportunity.updated_at,
+)
+
+TREND_COLUMNS = (
+    Opportunity.id,
+    Opportunity.title,
+    Opportunity.score,
+    Opportunity.status,
+    Opportunity.budget_amount,
+    Opportunity.created_at,
+)
+
+
+# The weekly report lists deadlines this many days ahead
+REPORT_DEADLINE_HORIZON_DAYS = 14
+
+
+def _report_window(period_days: int):
+    """
+    Rows a report over the last `period_days` looks at: created or updated
+    in the period, or with a deadline coming up. Uses local time like the
+    report generator.
+    """
+    now = datetime.now()
+    period_start = now - timedelta(days=period_days)
+    return or_(
+        Opportunity.created_at >= period_start,
+        Opportunity.updated_at >= period_start,
+        Opportunity.deadline_at.between(now, now + timedelta(days=REPORT_DEADLINE_HORIZON_DAYS)),
+    )
+
+
+def _opportunity_dicts(db: Session, columns, *criteria) -> List[dict]:
+    """
+    Plain dicts of the given opportunity columns, streamed in batches
+    instead of hydrating full ORM objects. Datetimes are ISO strings, as
+    the prediction/report engines expect.
+    """
+    stmt = select(*columns).where(*criteria).execution_options(
+        stream_results=True, yield_per=REPORT_YIELD_PER
+    )
+    opp_dicts = []
+    for row in db.execute(stmt).mappings():
+        opp = dict(row)
+        for key in ("deadline_at", "created_at", "updated_at"):
+            value = opp.get(key)
+            if value is not None:
+                opp[key] = value.isoformat()
+        opp_dicts.append(opp)
+    return opp_dicts
+
 
 # Pydantic models for API
 class PredictionResponse(BaseModel):
@@ -61,25 +137,11 @@ async def get_prediction(
     current_user: User = Depends(get_current_user)
 ):
     """Get AI prediction for a specific opportunity."""
-    opportunity = db.query(Opportunity).filter(Opportunity.id == opportunity_id).first()
-    if not opportunity:
+    # Same column rows as the batch/report paths, no ORM hydration
+    opp_dicts = _opportunity_dicts(db, REPORT_COLUMNS, Opportunity.id == opportunity_id)
+    if not opp_dicts:
         raise HTTPException(status_code=404, detail="Opportunity not found")
-    
-    # Convert to dict for prediction engine
-    opp_dict = {
-        "id": opportunity.id,
-        "title": opportunity.title,
-        "description": opportunity.description,
-        "organization": opportunity.organization,
-        "score": opportunity.score,
-        "status": opportunity.status,
-        "budget_amount": opportunity.budget_amount,
-        "deadline_at": opportunity.deadline_at.isoformat() if opportunity.deadline_at else None,
-        "source_type": opportunity.source.source_type if opportunity.source else None,
-        "contact_email": opportunity.contact_email,
-        "created_at": opportunity.created_at.isoformat() if opportunity.created_at else None,
-        "updated_at": opportunity.updated_at.isoformat() if opportunity.updated_at else None,
-    }
+    opp_dict = opp_dicts[0]
     
     result = await predictions_engine.predict_opportunity(opp_dict)
     
@@ -102,31 +164,29 @@ async def batch_predict(
     current_user: User = Depends(get_current_user)
 ):
     """Get AI predictions for multiple opportunities."""
-    opportunities = db.query(Opportunity).filter(
-        Opportunity.id.in_(opportunity_ids)
-    ).all()
+    opportunity_ids = list(dict.fromkeys(opportunity_ids))
+    if len(opportunity_ids) > MAX_BATCH_PREDICT:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Maximum {MAX_BATCH_PREDICT} opportunities per batch",
+        )
     
-    if not opportunities:
+    opp_dicts = _opportunity_dicts(db, REPORT_COLUMNS, Opportunity.id.in_(opportunity_ids))
+    if not opp_dicts:
         raise HTTPException(status_code=404, detail="No opportunities found")
     
-    opp_dicts = [
-        {
-            "id": o.id,
-            "title": o.title,
-            "description": o.description,
-            "organization": o.organization,
-            "score": o.score,
-            "status": o.status,
-            "budget_amount": o.budget_amount,
-            "deadline_at": o.deadline_at.isoformat() if o.deadline_at else None,
-            "source_type": o.source.source_type if o.source else None,
-            "contact_email": o.contact_email,
-            "created_at": o.created_at.isoformat() if o.created_at else None,
-        }
-        for o in opportunities
-    ]
+    # Results in the order the IDs were requested
+    position = {opp_id: i for i, opp_id in enumerate(opportunity_ids)}
+    opp_dicts.sort(key=lambda o: position[o["id"]])
     
-    results = await predictions_engine.batch_predict(opp_dicts)
+    # Scoring is CPU-bound: run it in chunks and yield to the event loop
+    # between them so a large batch doesn't stall other requests
+    results = []
+    for i in range(0, len(opp_dicts), BATCH_PREDICT_CHUNK):
+        results.extend(
+            await predictions_engine.batch_predict(opp_dicts[i:i + BATCH_PREDICT_CHUNK])
+        )
+        await asyncio.sleep(0)
     
     return [
         PredictionResponse(
@@ -150,23 +210,20 @@ async def get_trend_analysis(
     current_user: User = Depends(get_current_user)
 ):
     """Get trend analysis for opportunities."""
-    opportunities = db.query(Opportunity).all()
+    cache_key = f"predictions:trends:{period_days}:{opportunities_fingerprint(db)}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return TrendAnalysisResponse(**cached)
     
-    opp_dicts = [
-        {
-            "id": o.id,
-            "title": o.title,
-            "score": o.score,
-            "status": o.status,
-            "budget_amount": o.budget_amount,
-            "created_at": o.created_at.isoformat() if o.created_at else None,
-        }
-        for o in opportunities
-    ]
+    # The analysis only looks at opportunities created in the period
+    period_start = datetime.now() - timedelta(days=period_days)
+    opp_dicts = _opportunity_dicts(db, TREND_COLUMNS, Opportunity.created_at >= period_start)
     
     result = await predictions_engine.get_trend_analysis(opp_dicts, period_days)
     
-    return TrendAnalysisResponse(**result)
+    response = TrendAnalysisResponse(**result)
+    cache_set(cache_key, response.model_dump(mode="json"), ttl=REPORT_CACHE_TTL)
+    return response
 
 
 # Weekly Report endpoints
@@ -180,29 +237,16 @@ async def generate_weekly_report(
     current_user: User = Depends(get_current_user)
 ):
     """Generate a weekly report."""
-    opportunities = db.query(Opportunity).all()
+    cache_key = f"reports:weekly:{period_days}:{opportunities_fingerprint(db)}"
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return WeeklyReportResponse(**cached)
     
-    opp_dicts = [
-        {
-            "id": o.id,
-            "title": o.title,
-            "description": o.description,
-            "organization": o.organization,
-            "score": o.score,
-            "status": o.status,
-            "budget_amount": o.budget_amount,
-            "deadline_at": o.deadline_at.isoformat() if o.deadline_at else None,
-            "source_type": o.source.source_type if o.source else None,
-            "contact_email": o.contact_email,
-            "created_at": o.created_at.isoformat() if o.created_at else None,
-            "updated_at": o.updated_at.isoformat() if o.updated_at else None,
-        }
-        for o in opportunities
-    ]
+    opp_dicts = _opportunity_dicts(db, REPORT_COLUMNS, _report_window(period_days))
     
     report = await weekly_report_generator.generate_report(opp_dicts, period_days)
     
-    return WeeklyReportResponse(
+    response = WeeklyReportResponse(
         report_id=report.report_id,
         generated_at=report.generated_at.isoformat(),
         period_start=report.period_start.isoformat(),
@@ -214,6 +258,8 @@ async def generate_weekly_report(
         html_content=report.html_content,
         markdown_content=report.markdown_content
     )
+    cache_set(cache_key, response.model_dump(mode="json"), ttl=REPORT_CACHE_TTL)
+    return response
 
 
 @reports_router.post("/weekly/send")
@@ -221,30 +267,15 @@ async def send_weekly_report(
     background_tasks: BackgroundTasks,
     recipients: List[str] = None,
     channels: List[str] = None,  # "email", "slack", "discord"
+    period_days: int = 7,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Generate and send weekly report via configured channels."""
     # In production, this would integrate with actual notification services
+    opp_dicts = _opportunity_dicts(db, REPORT_COLUMNS, _report_window(period_days))
     
-    opportunities = db.query(Opportunity).all()
-    opp_dicts = [
-        {
-            "id": o.id,
-            "title": o.title,
-            "description": o.description,
-            "organization": o.organization,
-            "score": o.score,
-            "status": o.status,
-            "budget_amount": o.budget_amount,
-            "deadline_at": o.deadline_at.isoformat() if o.deadline_at else None,
-            "source_type": o.source.source_type if o.source else None,
-            "created_at": o.created_at.isoformat() if o.created_at else None,
-        }
-        for o in opportunities
-    ]
-    
-    report = await weekly_report_generator.generate_report(opp_dicts)
+    report = await weekly_report_generator.generate_report(opp_dicts, period_days)
     
     # Add background task to send report
     # background_tasks.add_task(send_report_notifications, report, recipients, channels)
@@ -3,13 +3,16 @@ Profiles API - Fit Score par Profil
 CRUD operations for profiles + score recomputation
 """
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
-from uuid import UUID
-import time
+import threading
 
+from cachetools import LRUCache
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import JSON, func, select, and_, or_, false, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.db import get_db
 from app.db.models import Profile, OpportunityProfileScore, Opportunity
@@ -21,15 +24,129 @@ from app.schemas.radar_features import (
     ProfileListResponse,
     OpportunityFitScore,
     RecomputeRequest,
-    RecomputeResponse,
+    RecomputeTaskResponse,
 )
 
 router = APIRouter(prefix="/profiles", tags=["profiles"])
 
+SCORE_UPSERT_BATCH_SIZE = 2000
+RECOMPUTE_CHUNK_SIZE = 1000
 
-def compute_fit_score(opportunity: Opportunity, profile: Profile) -> tuple[int, dict]:
+# Keyword scan results kept per matcher, keyed on (opportunity id, updated_at)
+KEYWORD_SCAN_CACHE_SIZE = 20000
+_MISSING = object()
+
+# Reasons stored for an opportunity hit by one of the profile's excluded keywords
+EXCLUDED_FIT_REASONS = {
+    "keyword_matches": [],
+    "excluded": True,
+    "budget_match": False,
+    "deadline_soon": False,
+    "contact_present": False,
+    "location_match": False,
+    "score_components": {},
+}
+
+# Opportunity columns read by compute_fit_score
+FIT_SCORE_COLUMNS = (
+    Opportunity.id,
+    Opportunity.search_text_lc,
+    Opportunity.score,
+    Opportunity.budget_amount,
+    Opportunity.deadline_at,
+    Opportunity.contact_email,
+    Opportunity.contact_phone,
+    Opportunity.location_region,
+    Opportunity.location_city,
+    Opportunity.updated_at,
+)
+
+
+class KeywordMatcher:
+    """
+    Keyword sets of a profile, lowercased once.
+    Matching uses plain substring tests: CPython's `in` is a C-level
+    search that beats a regex alternation (the `re` engine backtracks per
+    alternative, it is not a DFA).
+    Scan results are memoized per (opportunity id, updated_at): the text
+    only changes when the opportunity row does.
+    """
+    __slots__ = ("include", "exclude", "_results", "_lock")
+    
+    def __init__(self, include: tuple, exclude: tuple):
+        # (original keyword, lowercased keyword) - matches are reported as configured
+        self.include = tuple((kw, kw.lower()) for kw in include)
+        self.exclude = tuple({kw.lower() for kw in exclude})
+        self._results: LRUCache = LRUCache(maxsize=KEYWORD_SCAN_CACHE_SIZE)
+        self._lock = threading.Lock()
+    
+    def excluded(self, text: str) -> bool:
+        return any(kw in text for kw in self.exclude)
+    
+    def matches(self, text: str) -> list[str]:
+        return [kw for kw, kw_lc in self.include if kw_lc in text]
+    
+    def scan(self, opportunity) -> Optional[list[str]]:
+        """Included keywords found in an opportunity, or None if it is excluded"""
+        updated_at = getattr(opportunity, "updated_at", None)
+        key = (opportunity.id, updated_at)
+        if updated_at is not None:
+            with self._lock:
+                cached = self._results.get(key, _MISSING)
+            if cached is not _MISSING:
+                return None if cached is None else list(cached)
+        
+        # Lowercased by PostgreSQL on write. The column is deferred on ORM
+        # objects: read it only if already loaded (no per-object SELECT),
+        # otherwise rebuild it from the loaded text columns
+        if isinstance(opportunity, Opportunity):
+            text = opportunity.__dict__.get("search_text_lc")
+        else:
+            text = opportunity.search_text_lc
+        if text is None:
+            text = f"{opportunity.title or ''} {opportunity.description or ''} {opportunity.organization or ''}".lower()
+        result = None if self.excluded(text) else self.matches(text)
+        
+        if updated_at is not None:
+            with self._lock:
+                self._results[key] = None if result is None else tuple(result)
+        return result
+
+
+@lru_cache(maxsize=32)
+def _keyword_matcher(include: tuple, exclude: tuple) -> KeywordMatcher:
+    return KeywordMatcher(include, exclude)
+
+
+def excluded_keywords_clause(profile: Profile):
+    """SQL condition: the opportunity text contains one of the profile's excluded keywords"""
+    keywords = {kw.lower() for kw in profile.keywords_exclude or ()}
+    if not keywords:
+        return false()
+    return or_(*(
+        Opportunity.search_text_lc.contains(kw, autoescape=True) for kw in keywords
+    ))
+
+
+def build_profile_matcher(profile: Profile) -> KeywordMatcher:
+    """Get the (cached) keyword matcher for a profile's current keywords"""
+    return _keyword_matcher(
+        tuple(profile.keywords_include or ()),
+        tuple(profile.keywords_exclude or ()),
+    )
+
+
+def compute_fit_score(
+    opportunity: Opportunity,
+    profile: Profile,
+    matcher: Optional[KeywordMatcher] = None,
+    now: Optional[datetime] = None,
+) -> tuple[int, dict]:
     """
     Compute fit score for an opportunity against a profile.
+    `opportunity` may be an ORM object or a row of FIT_SCORE_COLUMNS.
+    When scoring many opportunities, pass `matcher` and `now` (naive UTC)
+    built once for the whole batch.
     Returns (score, reasons_dict).
     """
     reasons = {
@@ -42,32 +159,21 @@ def compute_fit_score(opportunity: Opportunity, profile: Profile) -> tuple[int,
         "score_components": {},
     }
     
-    weights = profile.weights or {
-        "score_base": 0.4,
-        "budget_match": 0.2,
-        "deadline_proximity": 0.15,
-        "contact_present": 0.15,
-        "location_match": 0.1,
-    }
+    w_base, w_budget, w_deadline, w_contact, w_location = profile.weights_vec
     
     # Start with base score component
     base_score = opportunity.score or 0
-    score_components = {"base": base_score * weights.get("score_base", 0.4)}
+    score_components = {"base": base_score * w_base}
     
-    # Check excluded keywords
-    text_to_check = f"{opportunity.title or ''} {opportunity.description or ''} {opportunity.organization or ''}".lower()
+    # Check excluded and included keywords
+    if matcher is None:
+        matcher = build_profile_matcher(profile)
     
-    if profile.keywords_exclude:
-        for keyword in profile.keywords_exclude:
-            if keyword.lower() in text_to_check:
-                reasons["excluded"] = True
-                return 0, reasons
-    
-    # Check included keywords
-    if profile.keywords_include:
-        for keyword in profile.keywords_include:
-            if keyword.lower() in text_to_check:
-                reasons["keyword_matches"].append(keyword)
+    keyword_matches = matcher.scan(opportunity)
+    if keyword_matches is None:
+        reasons["excluded"] = True
+        return 0, reasons
+    reasons["keyword_matches"] = keyword_matches
     
     # Budget match
     if profile.budget_min is not None or profile.budget_max is not None:
@@ -79,34 +185,32 @@ def compute_fit_score(opportunity: Opportunity, profile: Profile) -> tuple[int,
                 budget_ok = False
             if budget_ok:
                 reasons["budget_match"] = True
-                score_components["budget"] = 100 * weights.get("budget_match", 0.2)
+                score_components["budget"] = 100 * w_budget
     
     # Deadline proximity (bonus if deadline is within 30 days)
     if opportunity.deadline_at:
-        days_until = (opportunity.deadline_at - datetime.utcnow()).days
+        days_until = (opportunity.deadline_at - (now or datetime.utcnow())).days
         if 0 < days_until <= 30:
             reasons["deadline_soon"] = True
             # More points for closer deadlines (but not past)
             deadline_score = max(0, min(100, (30 - days_until) / 30 * 100))
-            score_components["deadline"] = deadline_score * weights.get("deadline_proximity", 0.15)
+            score_components["deadline"] = deadline_score * w_deadline
     
     # Contact present
     if opportunity.contact_email or opportunity.contact_phone:
         reasons["contact_present"] = True
-        score_components["contact"] = 100 * weights.get("contact_present", 0.15)
+        score_components["contact"] = 100 * w_contact
     
     # Location match
     if profile.regions or profile.cities:
         location_match = False
-        if opportunity.location_region and profile.regions:
-            if opportunity.location_region.lower() in [r.lower() for r in profile.regions]:
-                location_match = True
-        if opportunity.location_city and profile.cities:
-            if opportunity.location_city.lower() in [c.lower() for c in profile.cities]:
-                location_match = True
+        if opportunity.location_region and opportunity.location_region.lower() in profile.regions_lc:
+            location_match = True
+        if opportunity.location_city and opportunity.location_city.lower() in profile.cities_lc:
+            location_match = True
         if location_match:
             reasons["location_match"] = True
-            score_components["location"] = 100 * weights.get("location_match", 0.1)
+            score_components["location"] = 100 * w_location
     
     reasons["score_components"] = score_components
     
@@ -117,6 +221,153 @@ def compute_fit_score(opportunity: Opportunity, profile: Profile) -> tuple[int,
     return fit_score, reasons
 
 
+def upsert_profile_scores(db: Session, values: list[dict]) -> None:
+    """Insert or refresh (opportunity_id, profile_id) fit scores in batched statements"""
+    # Batched to stay well under PostgreSQL's 65535 bind-parameter limit
+    for i in range(0, len(values), SCORE_UPSERT_BATCH_SIZE):
+        stmt = pg_insert(OpportunityProfileScore).values(
+            values[i:i + SCORE_UPSERT_BATCH_SIZE]
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_opportunity_profile",
+            set_={
+                "fit_score": stmt.excluded.fit_score,
+                "reasons": stmt.excluded.reasons,
+                "computed_at": stmt.excluded.computed_at,
+            },
+        )
+        db.execute(stmt)
+
+
+def _after_keyset(last_score, last_id):
+    """Rows after (last_score, last_id) in (score DESC NULLS LAST, id DESC) order"""
+    if last_score is None:
+        # Already into the NULL tail: only the id tiebreaker is left
+        return and_(Opportunity.score.is_(None), Opportunity.id < last_id)
+    return or_(
+        Opportunity.score < last_score,
+        and_(Opportunity.score == last_score, Opportunity.id < last_id),
+        Opportunity.score.is_(None),
+    )
+
+
+def _top_window(db: Session, candidates: list, limit: int) -> list:
+    """
+    Conditions restricting `candidates` to their first `limit` rows in
+    (score DESC NULLS LAST, id DESC) order, bounded by the limit-th row's key.
+    """
+    cutoff = db.execute(
+        select(Opportunity.score, Opportunity.id)
+        .where(*candidates)
+        .order_by(Opportunity.score.desc().nulls_last(), Opportunity.id.desc())
+        .offset(limit - 1)
+        .limit(1)
+    ).first()
+    if cutoff is None:
+        # Fewer than `limit` candidates: all of them are in the window
+        return candidates
+    return [*candidates, ~_after_keyset(cutoff.score, cutoff.id)]
+
+
+def zero_excluded_scores(db: Session, profile: Profile, window: list, now: datetime) -> int:
+    """
+    Write a 0 score for opportunities of `window` hit by an excluded keyword,
+    as one INSERT ... SELECT: the rows never leave PostgreSQL.
+    Returns the number of scores written.
+    """
+    if not profile.keywords_exclude:
+        return 0
+    
+    rows = (
+        select(
+            Opportunity.id,
+            literal(profile.id),
+            literal(0),
+            literal(EXCLUDED_FIT_REASONS, JSON),
+            literal(now),
+        )
+        .where(*window, excluded_keywords_clause(profile))
+    )
+    stmt = pg_insert(OpportunityProfileScore).from_select(
+        ["opportunity_id", "profile_id", "fit_score", "reasons", "computed_at"],
+        rows,
+    )
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_opportunity_profile",
+        set_={
+            "fit_score": stmt.excluded.fit_score,
+            "reasons": stmt.excluded.reasons,
+            "computed_at": stmt.excluded.computed_at,
+        },
+    )
+    return db.execute(stmt).rowcount
+
+
+def recompute_scores(db: Session, profile: Profile, only_new: bool, limit: int) -> int:
+    """
+    Recompute fit scores of the top `limit` open opportunities for a profile.
+    Those hit by an excluded keyword are zeroed in SQL and never fetched;
+    the others are read in keyset-paginated chunks
+    (score DESC, id DESC), each chunk upserted and committed so row locks
+    are held briefly.
+    Returns the number of opportunities processed.
+    """
+    candidates = [Opportunity.status.notin_(["ARCHIVED", "LOST"])]
+    
+    if only_new:
+        # Only opportunities without a score for this profile
+        existing_ids = select(OpportunityProfileScore.opportunity_id).where(
+            OpportunityProfileScore.profile_id == profile.id
+        )
+        candidates.append(~Opportunity.id.in_(existing_ids))
+    
+    now = datetime.utcnow()
+    # Fixed before any write: zeroing below can't shift it under only_new
+    window = _top_window(db, candidates, limit)
+    
+    # Zeroed rather than skipped, so a keyword newly added to
+    # keywords_exclude overwrites the old scores
+    processed = zero_excluded_scores(db, profile, window, now)
+    db.commit()
+    
+    # Matches ix_opportunities_score_id, so each chunk is an index range scan
+    stmt = select(*FIT_SCORE_COLUMNS).where(
+        *window, ~excluded_keywords_clause(profile)
+    ).order_by(Opportunity.score.desc().nulls_last(), Opportunity.id.desc())
+    
+    # Exclusions are already applied, only include keywords are left to scan
+    matcher = _keyword_matcher(tuple(profile.keywords_include or ()), ())
+    
+    after = None
+    while processed < limit:
+        chunk_stmt = stmt if after is None else stmt.where(after)
+        opportunities = db.execute(
+            chunk_stmt.limit(min(RECOMPUTE_CHUNK_SIZE, limit - processed))
+        ).all()
+        if not opportunities:
+            break
+        
+        values = []
+        for opp in opportunities:
+            fit_score, reasons = compute_fit_score(opp, profile, matcher, now)
+            values.append({
+                "opportunity_id": opp.id,
+                "profile_id": profile.id,
+                "fit_score": fit_score,
+                "reasons": reasons,
+                "computed_at": now,
+            })
+        
+        upsert_profile_scores(db, values)
+        db.commit()
+        
+        processed += len(opportunities)
+        last = opportunities[-1]
+        after = _after_keyset(last.score, last.id)
+    
+    return processed
+
+
 @router.get("", response_model=ProfileListResponse)
 def list_profiles(
     is_active: Optional[bool] = None,
@@ -131,10 +382,8 @@ def list_profiles(
     
     profiles = query.order_by(Profile.name).all()
     
-    return ProfileListResponse(
-        profiles=[ProfileResponse.model_validate(p) for p in profiles],
-        total=len(profiles)
-    )
+    # Validated once by response_model (from_attributes) rather than per row here
+    return {"profiles": profiles, "total": len(profiles)}
 
 
 @router.post("", response_model=ProfileResponse, status_code=status.HTTP_201_CREATED)
@@ -168,19 +417,18 @@ def create_profile(
     
     db.add(profile)
     db.commit()
-    db.refresh(profile)
     
     return profile
 
 
 @router.get("/{profile_id}", response_model=ProfileResponse)
 def get_profile(
-    profile_id: UUID,
+    profile_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
     """Get a profile by ID"""
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
+    profile = db.get(Profile, profile_id)
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -191,13 +439,13 @@ def get_profile(
 
 @router.patch("/{profile_id}", response_model=ProfileResponse)
 def update_profile(
-    profile_id: UUID,
+    profile_id: int,
     data: ProfileUpdate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_admin_user),
 ):
     """Update a profile (admin only)"""
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
+    profile = db.get(Profile, profile_id)
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -212,22 +460,22 @@ def update_profile(
     
     for field, value in update_data.items():
         setattr(profile, field, value)
+    profile.refresh_fit_cache()
     
     profile.updated_at = datetime.utcnow()
     db.commit()
-    db.refresh(profile)
     
     return profile
 
 
 @router.delete("/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_profile(
-    profile_id: UUID,
+    profile_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_admin_user),
 ):
     """Delete a profile (admin only)"""
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
+    profile = db.get(Profile, profile_id)
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -238,102 +486,71 @@ def delete_profile(
     db.commit()
 
 
-@router.post("/{profile_id}/recompute", response_model=RecomputeResponse)
+@router.post(
+    "/{profile_id}/recompute",
+    response_model=RecomputeTaskResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
 def recompute_profile_scores(
-    profile_id: UUID,
+    profile_id: int,
     data: RecomputeRequest = RecomputeRequest(),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_admin_user),
 ):
-    """Recompute fit scores for all opportunities against this profile"""
-    start_time = time.time()
+    """Queue a recompute of fit scores for all opportunities against this profile"""
+    from app.workers.radar_features_tasks import recompute_profile_scores_job
     
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
+    profile = db.get(Profile, profile_id)
     if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found"
         )
     
-    # Get opportunities to process
-    query = db.query(Opportunity).filter(
-        Opportunity.status.notin_(["ARCHIVED", "LOST"])
-    )
-    
-    if data.only_new:
-        # Only opportunities without a score for this profile
-        existing_ids = db.query(OpportunityProfileScore.opportunity_id).filter(
-            OpportunityProfileScore.profile_id == profile_id
-        ).subquery()
-        query = query.filter(~Opportunity.id.in_(existing_ids))
-    
-    opportunities = query.order_by(Opportunity.score.desc()).limit(data.limit).all()
-    
-    processed = 0
-    for opp in opportunities:
-        fit_score, reasons = compute_fit_score(opp, profile)
-        
-        # Upsert score
-        existing_score = db.query(OpportunityProfileScore).filter(
-            OpportunityProfileScore.opportunity_id == opp.id,
-            OpportunityProfileScore.profile_id == profile_id
-        ).first()
-        
-        if existing_score:
-            existing_score.fit_score = fit_score
-            existing_score.reasons = reasons
-            existing_score.computed_at = datetime.utcnow()
-        else:
-            new_score = OpportunityProfileScore(
-                opportunity_id=opp.id,
-                profile_id=profile_id,
-                fit_score=fit_score,
-                reasons=reasons,
-            )
-            db.add(new_score)
-        
-        processed += 1
-    
-    db.commit()
+    task = recompute_profile_scores_job.delay(profile.id, data.only_new, data.limit)
     
-    duration = time.time() - start_time
-    
-    return RecomputeResponse(
-        profile_id=profile_id,
-        opportunities_processed=processed,
-        duration_seconds=round(duration, 2)
+    return RecomputeTaskResponse(
+        profile_id=profile.id,
+        task_id=task.id,
+        message=f"Fit score recompute started for profile: {profile.name}",
     )
 
 
-@router.get("/{profile_id}/scores", response_model=list[OpportunityFitScore])
+@router.get(
+    "/{profile_id}/scores",
+    response_model=list[OpportunityFitScore],
+    response_class=ORJSONResponse,
+)
 def get_profile_scores(
-    profile_id: UUID,
+    profile_id: int,
     min_score: int = Query(default=0, ge=0, le=100),
     limit: int = Query(default=50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
     """Get top fit scores for a profile"""
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
-    if not profile:
+    rows = db.query(OpportunityProfileScore, Profile.name).join(
+        Profile, Profile.id == OpportunityProfileScore.profile_id
+    ).filter(
+        OpportunityProfileScore.profile_id == profile_id,
+        OpportunityProfileScore.fit_score >= min_score
+    ).order_by(OpportunityProfileScore.fit_score.desc()).limit(limit).all()
+    
+    # No rows: tell a missing profile apart from a profile without scores
+    if not rows and db.get(Profile, profile_id) is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found"
         )
     
-    scores = db.query(OpportunityProfileScore).filter(
-        OpportunityProfileScore.profile_id == profile_id,
-        OpportunityProfileScore.fit_score >= min_score
-    ).order_by(OpportunityProfileScore.fit_score.desc()).limit(limit).all()
-    
     return [
-        OpportunityFitScore(
-            opportunity_id=s.opportunity_id,
-            profile_id=s.profile_id,
-            profile_name=profile.name,
-            fit_score=s.fit_score,
-            reasons=s.reasons,
-            computed_at=s.computed_at,
-        )
-        for s in scores
+        {
+            "opportunity_id": s.opportunity_id,
+            "profile_id": s.profile_id,
+            "profile_name": profile_name,
+            "fit_score": s.fit_score,
+            "reasons": s.reasons,
+            "computed_at": s.computed_at,
+        }
+        for s, profile_name in rows
     ]
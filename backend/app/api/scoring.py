@@ -2,11 +2,12 @@
 Scoring rules endpoints + Artist scoring API
 """
 from typing import List, Optional
-from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.db import get_db
 from app.db.models.user import User
@@ -26,11 +27,39 @@ from app.scoring import (
 
 router = APIRouter(prefix="/scoring", tags=["scoring"])
 
+# Static fee tier reference, encoded once at import
+FEE_TIERS = {
+    "tiers": [
+        {"tier": 1, "name": "TIER_1", "score_range": "0-24", "fee_min": 1500, "fee_max": 5000},
+        {"tier": 2, "name": "TIER_2", "score_range": "25-39", "fee_min": 5000, "fee_max": 15000},
+        {"tier": 3, "name": "TIER_3", "score_range": "40-54", "fee_min": 15000, "fee_max": 40000},
+        {"tier": 4, "name": "TIER_4", "score_range": "55-69", "fee_min": 40000, "fee_max": 100000},
+        {"tier": 5, "name": "TIER_5", "score_range": "70-89", "fee_min": 100000, "fee_max": 300000},
+        {"tier": 6, "name": "TIER_6", "score_range": "90-100", "fee_min": 300000, "fee_max": 1000000},
+    ],
+    "score_weights": {
+        "spotify_max": 40,
+        "social_max": 40,
+        "live_bonus_max": 20,
+        "quality_factor_range": "0.60-1.10"
+    },
+    "notes": [
+        "SpotifyScore = 40 × (0.70 × popularity/100 + 0.30 × log_norm(followers))",
+        "SocialScore = YouTube(0-20) + Instagram(0-12) + TikTok(0-8)",
+        "LiveBonus = DatesBonus(0-8) + FestivalsBonus(0-6) + VenueBonus(0-6)",
+        "FinalScore = clamp((SpotifyScore + SocialScore) × QualityFactor + LiveBonus, 0, 100)"
+    ]
+}
+FEE_TIERS_JSON = orjson.dumps(FEE_TIERS)
+
 
 # === Pydantic Models for Artist Scoring ===
 
 class ArtistScoreRequest(BaseModel):
     """Request body for artist scoring"""
+    # Strict: JSON numbers only, no string-to-number coercion
+    model_config = ConfigDict(strict=True)
+    
     # Spotify data (required)
     popularity: int = Field(..., ge=0, le=100, description="Spotify popularity (0-100)")
     followers: int = Field(..., ge=0, description="Spotify followers count")
@@ -65,6 +94,17 @@ class ScoreBreakdown(BaseModel):
     popularity_score: float = Field(..., description="0-100 (before live)")
     
 
+# (ScoreBreakdown field, decimals) - same attribute names on ArtistScoreResult
+BREAKDOWN_DIGITS = (
+    ("spotify_score", 2),
+    ("social_score", 2),
+    ("live_bonus", 2),
+    ("live_bonus_effective", 2),
+    ("quality_factor", 3),
+    ("popularity_score", 2),
+)
+
+
 class ArtistScoreResponse(BaseModel):
     """Response for artist scoring"""
     # Main scores
@@ -95,7 +135,7 @@ class ArtistScoreResponse(BaseModel):
 
 # === Artist Scoring Endpoints ===
 
-@router.post("/artist", response_model=ArtistScoreResponse)
+@router.post("/artist", response_model=ArtistScoreResponse, response_class=ORJSONResponse)
 def score_artist(
     request: ArtistScoreRequest,
     current_user: User = Depends(get_current_user),
@@ -157,17 +197,13 @@ def score_artist(
         trend=trend
     )
     
-    # Build response
-    return ArtistScoreResponse(
+    # Build response (validated once here; returned as a Response so FastAPI does not re-validate it)
+    response = ArtistScoreResponse(
         final_score=round(result.final_score, 1),
-        breakdown=ScoreBreakdown(
-            spotify_score=round(result.spotify_score, 2),
-            social_score=round(result.social_score, 2),
-            live_bonus=round(result.live_bonus, 2),
-            live_bonus_effective=round(result.live_bonus_effective, 2),
-            quality_factor=round(result.quality_factor, 3),
-            popularity_score=round(result.popularity_score, 2)
-        ),
+        breakdown=ScoreBreakdown(**{
+            name: round(getattr(result, name), digits)
+            for name, digits in BREAKDOWN_DIGITS
+        }),
         confidence=round(result.confidence, 1),
         tier=result.tier.value,
         tier_name=result.tier.name,
@@ -180,6 +216,7 @@ def score_artist(
         social_details={k: round(v, 4) for k, v in result.social_details.items()},
         confidence_details=result.confidence_details
     )
+    return ORJSONResponse(response.model_dump(mode="json"))
 
 
 @router.post("/artist/quick")
@@ -214,30 +251,11 @@ def get_fee_tiers():
     
     Returns the score ranges and fee ranges for each tier.
     """
-    from app.scoring.artist_scorer import ArtistScorer
-    
-    return {
-        "tiers": [
-            {"tier": 1, "name": "TIER_1", "score_range": "0-24", "fee_min": 1500, "fee_max": 5000},
-            {"tier": 2, "name": "TIER_2", "score_range": "25-39", "fee_min": 5000, "fee_max": 15000},
-            {"tier": 3, "name": "TIER_3", "score_range": "40-54", "fee_min": 15000, "fee_max": 40000},
-            {"tier": 4, "name": "TIER_4", "score_range": "55-69", "fee_min": 40000, "fee_max": 100000},
-            {"tier": 5, "name": "TIER_5", "score_range": "70-89", "fee_min": 100000, "fee_max": 300000},
-            {"tier": 6, "name": "TIER_6", "score_range": "90-100", "fee_min": 300000, "fee_max": 1000000},
-        ],
-        "score_weights": {
-            "spotify_max": 40,
-            "social_max": 40,
-            "live_bonus_max": 20,
-            "quality_factor_range": "0.60-1.10"
-        },
-        "notes": [
-            "SpotifyScore = 40 × (0.70 × popularity/100 + 0.30 × log_norm(followers))",
-            "SocialScore = YouTube(0-20) + Instagram(0-12) + TikTok(0-8)",
-            "LiveBonus = DatesBonus(0-8) + FestivalsBonus(0-6) + VenueBonus(0-6)",
-            "FinalScore = clamp((SpotifyScore + SocialScore) × QualityFactor + LiveBonus, 0, 100)"
-        ]
-    }
+    return Response(
+        content=FEE_TIERS_JSON,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=3600"},
+    )
 
 
 # === Existing Scoring Rules Endpoints ===
@@ -263,12 +281,12 @@ def list_scoring_rules(
 
 @router.get("/rules/{rule_id}", response_model=ScoringRuleResponse)
 def get_scoring_rule(
-    rule_id: UUID,
+    rule_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """Get scoring rule by ID"""
-    rule = db.query(ScoringRule).filter(ScoringRule.id == rule_id).first()
+    rule = db.get(ScoringRule, rule_id)
     if not rule:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -302,13 +320,13 @@ def create_scoring_rule(
 
 @router.patch("/rules/{rule_id}", response_model=ScoringRuleResponse)
 def update_scoring_rule(
-    rule_id: UUID,
+    rule_id: int,
     update_data: ScoringRuleUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
     """Update scoring rule"""
-    rule = db.query(ScoringRule).filter(ScoringRule.id == rule_id).first()
+    rule = db.get(ScoringRule, rule_id)
     if not rule:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -326,12 +344,12 @@ def update_scoring_rule(
 
 @router.delete("/rules/{rule_id}")
 def delete_scoring_rule(
-    rule_id: UUID,
+    rule_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
     """Delete scoring rule"""
-    rule = db.query(ScoringRule).filter(ScoringRule.id == rule_id).first()
+    rule = db.get(ScoringRule, rule_id)
     if not rule:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -2,73 +2,90 @@
 Shortlists API - Daily Picks / Auto-Shortlist
 """
 from datetime import datetime, date, timedelta
+import heapq
 from typing import Optional
-from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from app.db import get_db
 from app.db.models import Profile, DailyShortlist, Opportunity, OpportunityProfileScore
 from app.api.deps import get_current_user
+from app.core.cache import cache_get, cache_set, invalidate_cache
 from app.schemas.radar_features import (
     DailyShortlistResponse,
     ShortlistListResponse,
     ShortlistItem,
+    ShortlistTaskResponse,
 )
 
 router = APIRouter(prefix="/shortlists", tags=["shortlists"])
 
+# (compute_fit_score reason key, shortlist reason tag), in display order
+REASON_TAGS = (
+    ("budget_match", "budget_match"),
+    ("deadline_soon", "deadline_soon"),
+    ("contact_present", "contact_present"),
+    ("location_match", "location_match"),
+    ("keyword_matches", "keyword_match"),
+)
+
+# Cache TTLs
+TODAY_SHORTLIST_TTL = 300  # 5 minutes
+
 
-def get_profile_name(db: Session, profile_id: UUID) -> str:
-    """Get profile name by ID"""
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
-    return profile.name if profile else "Unknown"
+def shortlist_response(shortlist: DailyShortlist) -> DailyShortlistResponse:
+    """Build the API response for a shortlist loaded with its profile"""
+    return DailyShortlistResponse(
+        id=shortlist.id,
+        date=shortlist.date,
+        profile_id=shortlist.profile_id,
+        profile_name=shortlist.profile.name if shortlist.profile else "Unknown",
+        items=shortlist.items or [],  # validated into ShortlistItem here, once
+        total_candidates=shortlist.total_candidates,
+        items_count=shortlist.items_count,
+        created_at=shortlist.created_at,
+    )
 
 
 @router.get("/today", response_model=Optional[DailyShortlistResponse])
 def get_today_shortlist(
-    profile_id: UUID = Query(..., description="Profile ID"),
+    profile_id: int = Query(..., description="Profile ID"),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
     """Get today's shortlist for a profile"""
     today = date.today()
-    
-    shortlist = db.query(DailyShortlist).filter(
-        DailyShortlist.date == today,
+    yesterday = today - timedelta(days=1)
+    
+    # Check cache first
+    cache_key = f"shortlists:today:{profile_id}:{today.isoformat()}"
+    cached = cache_get(cache_key)
+    if cached:
+        return DailyShortlistResponse(**cached)
+    
+    # Today's shortlist, or yesterday's if today is not generated yet
+    shortlist = db.query(DailyShortlist).options(
+        joinedload(DailyShortlist.profile)
+    ).filter(
+        DailyShortlist.date.in_([today, yesterday]),
         DailyShortlist.profile_id == profile_id
-    ).first()
-    
-    if not shortlist:
-        # Try yesterday if today not generated yet
-        yesterday = today - timedelta(days=1)
-        shortlist = db.query(DailyShortlist).filter(
-            DailyShortlist.date == yesterday,
-            DailyShortlist.profile_id == profile_id
-        ).first()
+    ).order_by(DailyShortlist.date.desc()).first()
     
     if not shortlist:
         return None
     
-    profile_name = get_profile_name(db, profile_id)
+    result = shortlist_response(shortlist)
+    cache_set(cache_key, result.model_dump(mode="json"), TODAY_SHORTLIST_TTL)
     
-    return DailyShortlistResponse(
-        id=shortlist.id,
-        date=shortlist.date,
-        profile_id=shortlist.profile_id,
-        profile_name=profile_name,
-        items=[ShortlistItem(**item) for item in (shortlist.items or [])],
-        total_candidates=shortlist.total_candidates,
-        items_count=shortlist.items_count,
-        created_at=shortlist.created_at,
-    )
+    return result
 
 
 @router.get("", response_model=ShortlistListResponse)
 def list_shortlists(
-    profile_id: Optional[UUID] = None,
+    profile_id: Optional[int] = None,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     limit: int = Query(default=30, ge=1, le=100),
@@ -76,7 +93,7 @@ def list_shortlists(
     current_user = Depends(get_current_user),
 ):
     """List shortlists with optional filters"""
-    query = db.query(DailyShortlist)
+    query = db.query(DailyShortlist).options(joinedload(DailyShortlist.profile))
     
     if profile_id:
         query = query.filter(DailyShortlist.profile_id == profile_id)
@@ -89,36 +106,22 @@ def list_shortlists(
     
     shortlists = query.order_by(DailyShortlist.date.desc()).limit(limit).all()
     
-    # Get profile names
-    profile_ids = list(set(s.profile_id for s in shortlists))
-    profiles = {p.id: p.name for p in db.query(Profile).filter(Profile.id.in_(profile_ids)).all()}
-    
     return ShortlistListResponse(
-        shortlists=[
-            DailyShortlistResponse(
-                id=s.id,
-                date=s.date,
-                profile_id=s.profile_id,
-                profile_name=profiles.get(s.profile_id, "Unknown"),
-                items=[ShortlistItem(**item) for item in (s.items or [])],
-                total_candidates=s.total_candidates,
-                items_count=s.items_count,
-                created_at=s.created_at,
-            )
-            for s in shortlists
-        ],
+        shortlists=[shortlist_response(s) for s in shortlists],
         total=len(shortlists)
     )
 
 
 @router.get("/{shortlist_id}", response_model=DailyShortlistResponse)
 def get_shortlist(
-    shortlist_id: UUID,
+    shortlist_id: int,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
 ):
     """Get a specific shortlist by ID"""
-    shortlist = db.query(DailyShortlist).filter(DailyShortlist.id == shortlist_id).first()
+    shortlist = db.query(DailyShortlist).options(
+        joinedload(DailyShortlist.profile)
+    ).filter(DailyShortlist.id == shortlist_id).first()
     
     if not shortlist:
         raise HTTPException(
@@ -126,59 +129,36 @@ def get_shortlist(
             detail="Shortlist not found"
         )
     
-    profile_name = get_profile_name(db, shortlist.profile_id)
-    
-    return DailyShortlistResponse(
-        id=shortlist.id,
-        date=shortlist.date,
-        profile_id=shortlist.profile_id,
-        profile_name=profile_name,
-        items=[ShortlistItem(**item) for item in (shortlist.items or [])],
-        total_candidates=shortlist.total_candidates,
-        items_count=shortlist.items_count,
-        created_at=shortlist.created_at,
-    )
+    return shortlist_response(shortlist)
 
 
-@router.post("/generate", response_model=DailyShortlistResponse)
-def generate_shortlist(
-    profile_id: UUID = Query(..., description="Profile ID"),
-    target_date: Optional[date] = None,
-    limit: int = Query(default=20, ge=5, le=50),
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user),
-):
-    """Manually generate a shortlist for a profile"""
-    from app.api.profiles import compute_fit_score
-    
-    target_date = target_date or date.today()
-    
-    # Check if profile exists
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
-    if not profile:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Profile not found"
-        )
-    
-    # Delete existing shortlist for this date/profile
-    existing = db.query(DailyShortlist).filter(
-        DailyShortlist.date == target_date,
-        DailyShortlist.profile_id == profile_id
-    ).first()
-    if existing:
-        db.delete(existing)
-        db.commit()
-    
-    # Get candidate opportunities (active, not archived)
-    candidates = db.query(Opportunity).filter(
+def build_shortlist(db: Session, profile: Profile, target_date: date, limit: int) -> DailyShortlist:
+    """
+    (Re)build a profile's shortlist for a date: score the top open
+    opportunities and keep the best `limit`. Commits the new shortlist.
+    """
+    from app.api.profiles import compute_fit_score, build_profile_matcher, FIT_SCORE_COLUMNS
+    
+    # Get candidate opportunities (active, not archived), as rows of the
+    # fit-score columns plus what the shortlist items show
+    candidates = db.query(
+        *FIT_SCORE_COLUMNS,
+        Opportunity.title,
+        Opportunity.organization,
+        Opportunity.url_primary,
+        Opportunity.category,
+    ).filter(
         Opportunity.status.notin_(["ARCHIVED", "LOST", "WON"]),
-    ).order_by(Opportunity.score.desc()).limit(500).all()
+    ).order_by(Opportunity.score.desc()).limit(500)
     
-    # Compute fit scores and build shortlist
+    # Compute fit scores and build shortlist, streaming the candidate rows
+    matcher = build_profile_matcher(profile)
+    now = datetime.utcnow()
     scored_items = []
-    for opp in candidates:
-        fit_score, reasons = compute_fit_score(opp, profile)
+    total_candidates = 0
+    for opp in candidates.yield_per(100):
+        total_candidates += 1
+        fit_score, reasons = compute_fit_score(opp, profile, matcher, now)
         
         if fit_score > 0:  # Skip excluded opportunities
             scored_items.append({
@@ -187,61 +167,87 @@ def generate_shortlist(
                 "reasons": reasons,
             })
     
-    # Sort by fit_score descending
-    scored_items.sort(key=lambda x: x["fit_score"], reverse=True)
+    # Top `limit` by fit_score (ties keep candidate order, like a stable sort)
+    top_items = heapq.nlargest(limit, scored_items, key=lambda x: x["fit_score"])
     
     # Build shortlist items
     shortlist_items = []
-    for item in scored_items[:limit]:
+    for item in top_items:
         opp = item["opportunity"]
-        reasons_list = []
         r = item["reasons"]
-        
-        if r.get("budget_match"):
-            reasons_list.append("budget_match")
-        if r.get("deadline_soon"):
-            reasons_list.append("deadline_soon")
-        if r.get("contact_present"):
-            reasons_list.append("contact_present")
-        if r.get("location_match"):
-            reasons_list.append("location_match")
-        if r.get("keyword_matches"):
-            reasons_list.append("keyword_match")
+        reasons_list = [tag for key, tag in REASON_TAGS if r.get(key)]
         if opp.score and opp.score >= 70:
             reasons_list.append("score_high")
         
-        shortlist_items.append({
-            "opportunity_id": str(opp.id),
-            "title": opp.title,
-            "organization": opp.organization,
-            "score": opp.score or 0,
-            "fit_score": item["fit_score"],
-            "reasons": reasons_list,
-            "deadline_at": opp.deadline_at.isoformat() if opp.deadline_at else None,
-            "url": opp.url_primary,
-            "category": opp.category.value if opp.category else None,
-        })
-    
-    # Create shortlist
-    shortlist = DailyShortlist(
+        # Validated here so reads can trust the stored JSON
+        shortlist_items.append(ShortlistItem(
+            opportunity_id=opp.id,
+            title=opp.title,
+            organization=opp.organization,
+            score=opp.score or 0,
+            fit_score=item["fit_score"],
+            reasons=reasons_list,
+            deadline_at=opp.deadline_at,
+            url=opp.url_primary,
+            category=opp.category.value if opp.category else None,
+        ).model_dump(mode="json"))
+    
+    # Create or replace the shortlist in one statement, so readers never
+    # see the date without one
+    values = {
+        "items": shortlist_items,
+        "total_candidates": total_candidates,
+        "items_count": len(shortlist_items),
+        "created_at": datetime.utcnow(),
+    }
+    stmt = pg_insert(DailyShortlist).values(
         date=target_date,
-        profile_id=profile_id,
-        items=shortlist_items,
-        total_candidates=len(candidates),
-        items_count=len(shortlist_items),
-    )
-    
-    db.add(shortlist)
+        profile_id=profile.id,
+        **values,
+    ).on_conflict_do_update(
+        index_elements=["profile_id", "date"],
+        set_=values,
+    ).returning(DailyShortlist)
+    
+    shortlist = db.scalars(
+        stmt, execution_options={"populate_existing": True}
+    ).one()
     db.commit()
-    db.refresh(shortlist)
+    invalidate_cache(f"shortlists:today:{profile.id}")
     
-    return DailyShortlistResponse(
-        id=shortlist.id,
-        date=shortlist.date,
-        profile_id=shortlist.profile_id,
-        profile_name=profile.name,
-        items=[ShortlistItem(**item) for item in shortlist_items],
-        total_candidates=shortlist.total_candidates,
-        items_count=shortlist.items_count,
-        created_at=shortlist.created_at,
+    return shortlist
+
+
+@router.post(
+    "/generate",
+    response_model=ShortlistTaskResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def generate_shortlist(
+    profile_id: int = Query(..., description="Profile ID"),
+    target_date: Optional[date] = None,
+    limit: int = Query(default=20, ge=5, le=50),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user),
+):
+    """Queue generation of a shortlist for a profile (poll /ingestion/task/{task_id})"""
+    from app.workers.radar_features_tasks import generate_shortlist_job
+    
+    target_date = target_date or date.today()
+    
+    # Check if profile exists
+    profile = db.get(Profile, profile_id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    
+    task = generate_shortlist_job.delay(profile.id, target_date.isoformat(), limit)
+    
+    return ShortlistTaskResponse(
+        profile_id=profile.id,
+        date=target_date,
+        task_id=task.id,
+        message=f"Shortlist generation started for profile: {profile.name}",
     )
@@ -6,7 +6,7 @@ from typing import Optional, List
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func, and_
 
 from app.db import get_db
@@ -23,6 +23,7 @@ from app.core.cache import cache_get, cache_set
 
 # Cache TTLs
 HEALTH_OVERVIEW_TTL = 300  # 5 minutes
+HEALTH_OVERVIEW_CACHE_KEY = "source_health:overview"
 
 router = APIRouter(prefix="/sources", tags=["sources"])
 
@@ -76,7 +77,7 @@ def get_recommendation(avg_score: float, error_rate: float, items: int) -> Optio
 def get_sources_health(
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
-    source_id: Optional[UUID] = None,
+    source_id: Optional[int] = None,
     min_score: Optional[int] = None,
     limit: int = Query(default=100, ge=1, le=500),
     db: Session = Depends(get_db),
@@ -88,7 +89,9 @@ def get_sources_health(
     if not date_to:
         date_to = date.today()
     
-    query = db.query(SourceHealth).filter(
+    query = db.query(SourceHealth).options(
+        joinedload(SourceHealth.source).load_only(SourceConfig.name)
+    ).filter(
         SourceHealth.date >= date_from,
         SourceHealth.date <= date_to,
     )
@@ -104,29 +107,10 @@ def get_sources_health(
         SourceHealth.health_score.asc()
     ).limit(limit).all()
     
-    # Get source names
-    source_ids = list(set(h.source_id for h in health_records))
-    sources = {s.id: s.name for s in db.query(SourceConfig).filter(
-        SourceConfig.id.in_(source_ids)
-    ).all()}
-    
-    metrics = []
-    for h in health_records:
-        metrics.append(SourceHealthMetrics(
-            source_id=h.source_id,
-            source_name=sources.get(h.source_id, "Unknown"),
-            date=h.date,
-            requests=h.requests,
-            success_rate=h.success_rate,
-            avg_latency_ms=h.avg_latency_ms,
-            items_found=h.items_found,
-            items_kept=h.items_kept,
-            items_new=h.items_new,
-            duplicates_rate=h.duplicates_rate,
-            health_score=h.health_score,
-            last_error=h.last_error,
-            error_types=h.error_types or {},
-        ))
+    metrics = [
+        SourceHealthMetrics.from_record(h, h.source.name if h.source else "Unknown")
+        for h in health_records
+    ]
     
     return SourceHealthListResponse(
         sources=metrics,
@@ -143,34 +127,41 @@ def get_sources_health_overview(
 ):
     """Get overview of all sources health"""
     # Check cache first
-    cache_key = "source_health:overview"
-    cached = cache_get(cache_key)
+    cached = cache_get(HEALTH_OVERVIEW_CACHE_KEY)
     if cached:
         return SourceHealthOverview(**cached)
     
     # Get all sources
-    sources = db.query(SourceConfig).all()
+    sources = db.query(
+        SourceConfig.id, SourceConfig.name, SourceConfig.is_active
+    ).all()
     
-    # Get health data for last 7 days
+    # Aggregate health data for last 7 days, one row per source
     week_ago = date.today() - timedelta(days=7)
+    health_by_source = {
+        row.source_id: row
+        for row in db.query(
+            SourceHealth.source_id,
+            func.avg(SourceHealth.health_score).label("avg_health"),
+            func.coalesce(func.sum(SourceHealth.items_new), 0).label("total_items"),
+            func.coalesce(func.sum(SourceHealth.error_count), 0).label("total_errors"),
+            func.coalesce(func.sum(SourceHealth.requests), 0).label("total_requests"),
+        ).filter(
+            SourceHealth.date >= week_ago,
+        ).group_by(SourceHealth.source_id).all()
+    }
     
     summaries = []
     total_health = 0
     sources_needing_attention = 0
     
     for source in sources:
-        # Get health records for this source
-        health_records = db.query(SourceHealth).filter(
-            SourceHealth.source_id == source.id,
-            SourceHealth.date >= week_ago,
-        ).all()
+        health = health_by_source.get(source.id)
         
-        if health_records:
-            avg_health = sum(h.health_score for h in health_records) / len(health_records)
-            total_items = sum(h.items_new for h in health_records)
-            total_errors = sum(h.error_count for h in health_records)
-            total_requests = sum(h.requests for h in health_records)
-            error_rate = total_errors / total_requests if total_requests > 0 else 0
+        if health:
+            avg_health = float(health.avg_health)
+            total_items = health.total_items
+            error_rate = health.total_errors / health.total_requests if health.total_requests > 0 else 0
         else:
             avg_health = 100 if source.is_active else 0
             total_items = 0
@@ -207,14 +198,14 @@ def get_sources_health_overview(
     )
     
     # Cache the result
-    cache_set(cache_key, result.model_dump(mode="json"), HEALTH_OVERVIEW_TTL)
+    cache_set(HEALTH_OVERVIEW_CACHE_KEY, result.model_dump(mode="json"), HEALTH_OVERVIEW_TTL)
     
     return result
 
 
 @router.get("/health/{source_id}", response_model=List[SourceHealthMetrics])
 def get_source_health_history(
-    source_id: UUID,
+    source_id: int,
     days: int = Query(default=30, ge=1, le=90),
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user),
@@ -235,21 +226,7 @@ def get_source_health_history(
     ).order_by(SourceHealth.date.desc()).all()
     
     return [
-        SourceHealthMetrics(
-            source_id=h.source_id,
-            source_name=source.name,
-            date=h.date,
-            requests=h.requests,
-            success_rate=h.success_rate,
-            avg_latency_ms=h.avg_latency_ms,
-            items_found=h.items_found,
-            items_kept=h.items_kept,
-            items_new=h.items_new,
-            duplicates_rate=h.duplicates_rate,
-            health_score=h.health_score,
-            last_error=h.last_error,
-            error_types=h.error_types or {},
-        )
+        SourceHealthMetrics.from_record(h, source.name)
         for h in health_records
     ]
 
@@ -1,10 +1,12 @@
 """
 Source configuration endpoints
 """
-from typing import List
+import threading
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from cachetools import TTLCache
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.db import get_db
@@ -16,27 +18,51 @@ from app.schemas.source import (
     SourceTestResult
 )
 from app.api.deps import get_current_user, require_admin
+from app.api.source_health import HEALTH_OVERVIEW_CACHE_KEY
+from app.core.cache import cache_delete
 from app.ingestion.factory import get_connector
 
 router = APIRouter(prefix="/sources", tags=["sources"])
 
+# Active sources matched by trigger_ingestion, keyed by (ids, types).
+# Holds plain dicts, not ORM rows; cleared on any source write here,
+# other workers catch up within the TTL.
+ACTIVE_SOURCES_CACHE_TTL = 15  # seconds
+active_sources_cache: TTLCache = TTLCache(maxsize=1024, ttl=ACTIVE_SOURCES_CACHE_TTL)
+active_sources_cache_lock = threading.Lock()
+
+
+def clear_active_sources_cache():
+    """Drop cached active source lookups and the health overview built from them"""
+    with active_sources_cache_lock:
+        active_sources_cache.clear()
+    cache_delete(HEALTH_OVERVIEW_CACHE_KEY)  # is_active and names feed the overview
+
 
 @router.get("", response_model=List[SourceConfigResponse])
 def list_sources(
     is_active: bool = None,
     source_type: SourceType = None,
+    after: Optional[str] = Query(None, description="Name of the last source already received"),
+    limit: int = Query(500, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """List all source configurations"""
+    """
+    List source configurations by name.
+    At most `limit` per call; pass the last name as `after` for the next page.
+    """
     query = db.query(SourceConfig)
     
     if is_active is not None:
         query = query.filter(SourceConfig.is_active == is_active)
     if source_type:
         query = query.filter(SourceConfig.source_type == source_type)
+    if after is not None:
+        # Names are unique, so they work as a keyset
+        query = query.filter(SourceConfig.name > after)
     
-    return query.order_by(SourceConfig.name).all()
+    return query.order_by(SourceConfig.name).limit(limit).all()
 
 
 @router.get("/{source_id}", response_model=SourceConfigResponse)
@@ -76,6 +102,7 @@ def create_source(
     db.add(source)
     db.commit()
     db.refresh(source)
+    clear_active_sources_cache()
     return source
 
 
@@ -100,6 +127,7 @@ def update_source(
     
     db.commit()
     db.refresh(source)
+    clear_active_sources_cache()
     return source
 
 
@@ -119,6 +147,7 @@ def delete_source(
     
     db.delete(source)
     db.commit()
+    clear_active_sources_cache()
     return {"message": "Source deleted successfully"}
 
 
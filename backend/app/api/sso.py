@@ -1,8 +1,8 @@
 """
 SSO Authentication endpoints (Google + Apple)
 """
+import json
 import secrets
-from datetime import datetime, timedelta
 from typing import Optional
 from urllib.parse import urlencode
 
@@ -10,9 +10,11 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
+from redis.exceptions import RedisError
 
 from app.db import get_db
 from app.db.models.user import User
+from app.core.cache import redis_client
 from app.core.config import settings
 from app.core.sso import SSOService
 from app.api.deps import get_current_user
@@ -20,8 +22,36 @@ from app.api.deps import get_current_user
 router = APIRouter(prefix="/auth/sso", tags=["sso"])
 
 
-# State storage (in production, use Redis)
-_oauth_states: dict = {}
+# OAuth states live in Redis so any worker can verify the callback;
+# the TTL bounds the flow to 10 minutes
+OAUTH_STATE_TTL = 600  # seconds
+
+
+def store_oauth_state(state: str, provider: str, nonce: str) -> None:
+    """Remember an OAuth state until its callback (or expiry)"""
+    try:
+        redis_client.set(
+            f"oauth:state:{state}",
+            json.dumps({"provider": provider, "nonce": nonce}),
+            ex=OAUTH_STATE_TTL,
+        )
+    except RedisError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="SSO is temporarily unavailable"
+        )
+
+
+def pop_oauth_state(state: str) -> Optional[dict]:
+    """Consume an OAuth state (single use); None if unknown or expired"""
+    try:
+        raw = redis_client.getdel(f"oauth:state:{state}")
+    except RedisError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="SSO is temporarily unavailable"
+        )
+    return json.loads(raw) if raw else None
 
 
 class SSOInitResponse(BaseModel):
@@ -70,12 +100,7 @@ async def google_sso_init(request: Request):
     state = secrets.token_urlsafe(32)
     nonce = secrets.token_urlsafe(32)
     
-    # Store state (in production, use Redis with TTL)
-    _oauth_states[state] = {
-        "provider": "google",
-        "nonce": nonce,
-        "created_at": datetime.utcnow(),
-    }
+    store_oauth_state(state, "google", nonce)
     
     redirect_uri = f"{settings.backend_url}/api/v1/auth/sso/google/callback"
     
@@ -106,20 +131,13 @@ async def google_sso_callback(
     Exchanges code for tokens and creates/links user account.
     """
     # Verify state
-    stored_state = _oauth_states.pop(state, None)
+    stored_state = pop_oauth_state(state)
     if not stored_state or stored_state["provider"] != "google":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired state"
         )
     
-    # Check state age (max 10 minutes)
-    if datetime.utcnow() - stored_state["created_at"] > timedelta(minutes=10):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="State expired"
-        )
-    
     sso_service = SSOService(db)
     redirect_uri = f"{settings.backend_url}/api/v1/auth/sso/google/callback"
     
@@ -132,7 +150,7 @@ async def google_sso_callback(
         if not id_token:
             raise ValueError("No ID token in response")
         
-        claims = sso_service.decode_google_id_token(id_token)
+        claims = await sso_service.decode_google_id_token(id_token)
         
         # Extract user info from claims
         provider_account_id = claims["sub"]  # Stable Google ID
@@ -195,11 +213,7 @@ async def apple_sso_init(request: Request):
     state = secrets.token_urlsafe(32)
     nonce = secrets.token_urlsafe(32)
     
-    _oauth_states[state] = {
-        "provider": "apple",
-        "nonce": nonce,
-        "created_at": datetime.utcnow(),
-    }
+    store_oauth_state(state, "apple", nonce)
     
     redirect_uri = f"{settings.backend_url}/api/v1/auth/sso/apple/callback"
     
@@ -241,7 +255,7 @@ async def apple_sso_callback(
         )
     
     # Verify state
-    stored_state = _oauth_states.pop(state, None)
+    stored_state = pop_oauth_state(state)
     if not stored_state or stored_state["provider"] != "apple":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -9,9 +9,9 @@ from sqlalchemy.orm import Session
 
 from app.db import get_db
 from app.db.models.user import User, Role
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, revoke_user_tokens
 from app.schemas.user import UserCreate, UserUpdate, UserResponse
-from app.api.deps import get_current_user, require_admin
+from app.api.deps import get_current_user, require_admin, forget_user
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -130,6 +130,8 @@ def update_user(
     
     db.commit()
     db.refresh(user)
+    revoke_user_tokens(user.id)
+    forget_user(user.id)
     return user
 
 
@@ -153,6 +155,9 @@ def delete_user(
             detail="Cannot delete yourself",
         )
     
+    deleted_id = user.id
     db.delete(user)
     db.commit()
+    revoke_user_tokens(deleted_id)
+    forget_user(deleted_id)
     return {"message": "User deleted successfully"}
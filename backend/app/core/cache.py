@@ -3,6 +3,7 @@ Redis caching utilities for performance optimization
 """
 import json
 import hashlib
+import time
 from typing import Optional, Any, Callable
 from functools import wraps
 import redis
@@ -63,7 +64,8 @@ def cache_result(prefix: str, ttl: int = 300):
 def invalidate_cache(prefix: str):
     """Invalidate all cache keys with given prefix"""
     try:
-        keys = redis_client.keys(f"cache:{prefix}:*")
+        # SCAN instead of KEYS so large keyspaces don't block Redis
+        keys = list(redis_client.scan_iter(match=f"cache:{prefix}:*", count=500))
         if keys:
             redis_client.delete(*keys)
     except Exception:
@@ -95,3 +97,59 @@ def cache_delete(key: str):
         redis_client.delete(f"cache:{key}")
     except Exception:
         pass
+
+
+def cache_get_or_set_locked(
+    key: str,
+    ttl: int,
+    loader: Callable[[], Any],
+    lock_ttl: int = 10,
+    wait_timeout: float = 5.0,
+    poll_interval: float = 0.05,
+) -> Any:
+    """
+    Get value from cache, computing it with `loader` on a miss.
+    
+    On a miss only the worker that takes `lock:{key}` (SET NX EX) runs the
+    loader; the others poll the cache until it is filled, so an expiring
+    key doesn't trigger the same expensive computation on every worker.
+    Falls back to calling `loader` directly if Redis is unavailable or the
+    lock holder doesn't deliver in time.
+    """
+    cache_key = f"cache:{key}"
+    lock_key = f"lock:{key}"
+    
+    try:
+        cached = redis_client.get(cache_key)
+        if cached:
+            return json.loads(cached)
+        got_lock = redis_client.set(lock_key, "1", nx=True, ex=lock_ttl)
+    except Exception:
+        return loader()  # Redis error, continue without cache
+    
+    if got_lock:
+        try:
+            value = loader()
+            try:
+                redis_client.setex(cache_key, ttl, json.dumps(value, default=str))
+            except Exception:
+                pass
+            return value
+        finally:
+            try:
+                redis_client.delete(lock_key)
+            except Exception:
+                pass
+    
+    # Another worker is computing: wait for its result
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        time.sleep(poll_interval)
+        try:
+            cached = redis_client.get(cache_key)
+        except Exception:
+            break
+        if cached:
+            return json.loads(cached)
+    
+    return loader()
@@ -0,0 +1,36 @@
+"""
+Redis-backed fixed-window rate limiting shared across workers
+"""
+import logging
+
+from app.core.cache import redis_client
+
+logger = logging.getLogger(__name__)
+
+# INCR + EXPIRE in one atomic step so a crash can't leave a key without TTL
+_INCR_WITH_EXPIRE = redis_client.register_script("""
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return current
+""")
+
+
+def hit(key: str, limit: int, window: int = 60) -> bool:
+    """
+    Register one request for `key` and tell whether it is allowed.
+    
+    Args:
+        key: Bucket identifier (e.g., "contact_finder:42")
+        limit: Max requests per window
+        window: Window length in seconds
+    
+    Fails open if Redis is unavailable, like the cache helpers.
+    """
+    try:
+        current = _INCR_WITH_EXPIRE(keys=[f"ratelimit:{key}"], args=[window])
+    except Exception as e:
+        logger.warning(f"Rate limiter unavailable for {key}: {e}")
+        return True
+    return int(current) <= limit
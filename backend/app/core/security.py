@@ -1,16 +1,34 @@
 """
 Security utilities - Password hashing, JWT tokens
 """
+import hashlib
+import json
+import logging
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Union
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from .config import settings
+from .cache import redis_client
+
+logger = logging.getLogger(__name__)
 
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Verified access tokens: sha256(token) -> (user_id, exp timestamp).
+# Two tiers: a short per-process TTLCache in front of a Redis entry shared
+# by all workers. TTLCache isn't thread-safe and sync deps run in the
+# threadpool, hence the lock.
+TOKEN_CACHE_TTL = 5  # seconds, per process
+TOKEN_REDIS_TTL = 60  # seconds, shared (capped by the token's own exp)
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=TOKEN_CACHE_TTL)
+_token_cache_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -88,3 +106,96 @@ def verify_token(token: str, token_type: str = "access") -> Optional[str]:
     if user_id is None:
         return None
     return user_id
+
+
+def _token_cache_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _token_redis_key(key: bytes) -> str:
+    return f"jwt:{key.hex()[:32]}"
+
+
+def _user_tokens_key(user_id: str) -> str:
+    return f"user:{user_id}:tokens"
+
+
+def _redis_get_token(key: bytes) -> Optional[tuple]:
+    try:
+        cached = redis_client.get(_token_redis_key(key))
+    except Exception:
+        return None  # Redis error, fall back to verifying
+    if not cached:
+        return None
+    user_id, exp = json.loads(cached)
+    return user_id, exp
+
+
+def _redis_set_token(key: bytes, user_id: str, exp: Optional[float]):
+    ttl = TOKEN_REDIS_TTL
+    if exp is not None:
+        ttl = min(ttl, int(exp - time.time()))
+    if ttl <= 0:
+        return
+    
+    redis_key = _token_redis_key(key)
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.set(redis_key, json.dumps([user_id, exp]), ex=ttl)
+        # Index by user so all their cached tokens can be revoked at once
+        pipe.sadd(_user_tokens_key(user_id), redis_key)
+        pipe.expire(_user_tokens_key(user_id), TOKEN_REDIS_TTL)
+        pipe.execute()
+    except Exception as e:
+        logger.debug(f"Token cache write failed: {e}")
+
+
+def verify_access_token_cached(token: str) -> Optional[str]:
+    """
+    Same as verify_token(token, "access"), but skips the signature check
+    for tokens recently verified by this or any other worker.
+    The token's own expiry is still enforced on cache hits.
+    """
+    key = _token_cache_key(token)
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+    if cached is None:
+        cached = _redis_get_token(key)
+        if cached is not None:
+            with _token_cache_lock:
+                _token_cache[key] = cached
+    if cached is not None:
+        user_id, exp = cached
+        if exp is None or exp > time.time():
+            return user_id
+    
+    payload = decode_token(token)
+    if payload is None or payload.get("type") != "access":
+        return None
+    user_id = payload.get("sub")
+    if user_id is None:
+        return None
+    
+    exp = payload.get("exp")
+    with _token_cache_lock:
+        _token_cache[key] = (user_id, exp)
+    _redis_set_token(key, user_id, exp)
+    return user_id
+
+
+def revoke_user_tokens(user_id) -> None:
+    """
+    Forget cached verifications for a user (password/role/status change),
+    so their next request is re-checked against the database.
+    """
+    user_id = str(user_id)
+    with _token_cache_lock:
+        for key in [k for k, (uid, _) in _token_cache.items() if uid == user_id]:
+            _token_cache.pop(key, None)
+    
+    try:
+        tokens_key = _user_tokens_key(user_id)
+        redis_keys = redis_client.smembers(tokens_key)
+        redis_client.delete(tokens_key, *redis_keys)
+    except Exception as e:
+        logger.warning(f"Token cache revocation failed for user {user_id}: {e}")
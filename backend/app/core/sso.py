@@ -2,6 +2,8 @@
 SSO Authentication Service
 Handles Google and Apple OAuth/OIDC authentication
 """
+import re
+import time
 import httpx
 import jwt
 from datetime import datetime, timedelta
@@ -22,6 +24,44 @@ logger = logging.getLogger(__name__)
 # OIDC Configuration URLs
 GOOGLE_DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
 APPLE_KEYS_URL = "https://appleid.apple.com/auth/keys"
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ["https://accounts.google.com", "accounts.google.com"]
+
+# Fallback when Google's response carries no max-age
+GOOGLE_JWKS_DEFAULT_TTL = 3600
+
+# Shared client so logins reuse pooled keep-alive connections to the
+# providers instead of paying DNS + TLS handshake on every callback
+_http_client = httpx.AsyncClient(
+    timeout=10.0,
+    limits=httpx.Limits(max_keepalive_connections=20),
+)
+
+
+# Google signing keys by kid, shared across requests until max-age expires
+_google_jwks: Dict[str, Any] = {"keys": None, "exp": 0.0}
+
+
+async def get_google_signing_keys(force: bool = False) -> Dict[str, jwt.PyJWK]:
+    """Return Google's ID token signing keys, refetching when the cache expired"""
+    if not force and _google_jwks["keys"] is not None and time.monotonic() < _google_jwks["exp"]:
+        return _google_jwks["keys"]
+    
+    response = await _http_client.get(GOOGLE_JWKS_URL)
+    response.raise_for_status()
+    
+    max_age = re.search(r"max-age=(\d+)", response.headers.get("cache-control", ""))
+    ttl = int(max_age.group(1)) if max_age else GOOGLE_JWKS_DEFAULT_TTL
+    
+    keys = {key.key_id: key for key in jwt.PyJWKSet.from_dict(response.json()).keys}
+    _google_jwks["keys"] = keys
+    _google_jwks["exp"] = time.monotonic() + ttl
+    return keys
+
+
+async def close_http_client() -> None:
+    """Close the shared SSO HTTP client (app shutdown)"""
+    await _http_client.aclose()
 
 
 class SSOService:
@@ -37,10 +77,9 @@ class SSOService:
         if self._google_config:
             return self._google_config
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(GOOGLE_DISCOVERY_URL)
-            self._google_config = response.json()
-            return self._google_config
+        response = await _http_client.get(GOOGLE_DISCOVERY_URL)
+        self._google_config = response.json()
+        return self._google_config
     
     def get_google_auth_url(self, redirect_uri: str, state: str, nonce: str) -> str:
         """Generate Google OAuth authorization URL"""
@@ -59,34 +98,46 @@ class SSOService:
     
     async def exchange_google_code(self, code: str, redirect_uri: str) -> Dict[str, Any]:
         """Exchange authorization code for tokens with Google"""
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://oauth2.googleapis.com/token",
-                data={
-                    "code": code,
-                    "client_id": settings.google_client_id,
-                    "client_secret": settings.google_client_secret,
-                    "redirect_uri": redirect_uri,
-                    "grant_type": "authorization_code",
-                }
-            )
-            if response.status_code != 200:
-                logger.error(f"Google token exchange failed: {response.text}")
-                raise ValueError("Failed to exchange Google authorization code")
-            return response.json()
+        response = await _http_client.post(
+            "https://oauth2.googleapis.com/token",
+            data={
+                "code": code,
+                "client_id": settings.google_client_id,
+                "client_secret": settings.google_client_secret,
+                "redirect_uri": redirect_uri,
+                "grant_type": "authorization_code",
+            }
+        )
+        if response.status_code != 200:
+            logger.error(f"Google token exchange failed: {response.text}")
+            raise ValueError("Failed to exchange Google authorization code")
+        return response.json()
     
-    def decode_google_id_token(self, id_token: str) -> Dict[str, Any]:
+    async def decode_google_id_token(self, id_token: str) -> Dict[str, Any]:
         """
         Decode and verify Google ID token.
-        In production, you should verify the signature using Google's JWKS.
+        Signature is checked against Google's JWKS (cached per max-age).
         """
-        # Decode without verification for claims extraction
-        # In production: use PyJWT with Google's public keys
         try:
-            # For development: decode without verification
-            claims = jwt.decode(id_token, options={"verify_signature": False})
+            kid = jwt.get_unverified_header(id_token).get("kid")
+            keys = await get_google_signing_keys()
+            if kid not in keys:
+                # Key rotated since the last fetch
+                keys = await get_google_signing_keys(force=True)
+            if kid not in keys:
+                raise ValueError("Unknown Google signing key")
+            
+            claims = jwt.decode(
+                id_token,
+                keys[kid].key,
+                algorithms=["RS256"],
+                audience=settings.google_client_id,
+                options={"require": ["iss", "sub", "exp"]},
+            )
+            if claims["iss"] not in GOOGLE_ISSUERS:
+                raise ValueError("Invalid Google ID token issuer")
             return claims
-        except jwt.exceptions.DecodeError as e:
+        except jwt.exceptions.PyJWTError as e:
             logger.error(f"Failed to decode Google ID token: {e}")
             raise ValueError("Invalid Google ID token")
     
@@ -109,21 +160,20 @@ class SSOService:
         # Apple requires a client_secret JWT signed with your private key
         client_secret = self._generate_apple_client_secret()
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://appleid.apple.com/auth/token",
-                data={
-                    "code": code,
-                    "client_id": settings.apple_client_id,
-                    "client_secret": client_secret,
-                    "redirect_uri": redirect_uri,
-                    "grant_type": "authorization_code",
-                }
-            )
-            if response.status_code != 200:
-                logger.error(f"Apple token exchange failed: {response.text}")
-                raise ValueError("Failed to exchange Apple authorization code")
-            return response.json()
+        response = await _http_client.post(
+            "https://appleid.apple.com/auth/token",
+            data={
+                "code": code,
+                "client_id": settings.apple_client_id,
+                "client_secret": client_secret,
+                "redirect_uri": redirect_uri,
+                "grant_type": "authorization_code",
+            }
+        )
+        if response.status_code != 200:
+            logger.error(f"Apple token exchange failed: {response.text}")
+            raise ValueError("Failed to exchange Apple authorization code")
+        return response.json()
     
     def _generate_apple_client_secret(self) -> str:
         """Generate Apple client secret JWT"""
@@ -1,5 +1,5 @@
 """
 Database module - Session and base model
 """
-from .session import get_db, SessionLocal, engine
+from .session import get_db, SessionLocal, engine, get_async_db, AsyncSessionLocal, async_engine
 from .base import Base
@@ -4,7 +4,7 @@ Ingestion run model - logs for each ingestion execution
 import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, Text, DateTime, Enum, Integer, JSON, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, Enum, Integer, JSON, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -54,6 +54,12 @@ class IngestionRun(Base):
     # Relationships
     source_config = relationship("SourceConfig", back_populates="ingestion_runs")
     
+    # Indexes (latest runs first, by status or by source)
+    __table_args__ = (
+        Index('ix_ingestion_runs_status_started', 'status', started_at.desc()),
+        Index('ix_ingestion_runs_source_started', 'source_config_id', started_at.desc()),
+    )
+    
     def __repr__(self):
         return f"<IngestionRun {self.source_name} - {self.status}>"
     
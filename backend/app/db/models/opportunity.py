@@ -6,10 +6,10 @@ from datetime import datetime
 from enum import Enum as PyEnum
 from sqlalchemy import (
     Column, String, Text, Boolean, DateTime, Enum, ForeignKey,
-    Integer, Numeric, JSON, Table, Index
+    Integer, Numeric, JSON, Table, Index, Computed
 )
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 
 from app.db.base import Base
 
@@ -62,6 +62,21 @@ opportunity_tags = Table(
 )
 
 
+# Content is mostly French tenders/calls, hence the french text search config
+SEARCH_TS_CONFIG = "french"
+OPPORTUNITY_SEARCH_TSV = (
+    f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(title, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(organization, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_TS_CONFIG}', coalesce(description, '')), 'C')"
+)
+
+# Lowercased title/description/organization, scanned by profile keyword matching
+OPPORTUNITY_SEARCH_TEXT_LC = (
+    "lower(coalesce(title, '') || ' ' || coalesce(description, '') || ' ' || "
+    "coalesce(organization, ''))"
+)
+
+
 class Opportunity(Base):
     """Main opportunity model"""
     __tablename__ = "opportunities"
@@ -81,6 +96,17 @@ class Opportunity(Base):
     category = Column(Enum(OpportunityCategory), default=OpportunityCategory.OTHER, index=True)
     organization = Column(String(255), nullable=True, index=True)
     description = Column(Text, nullable=True)
+    # Weighted full-text document (title > organization > description), kept by Postgres.
+    # Deferred: only the search filter reads it, never loaded with the row
+    search_tsv = deferred(Column(
+        TSVECTOR,
+        Computed(OPPORTUNITY_SEARCH_TSV, persisted=True),
+    ))
+    # Deferred: selected explicitly by fit scoring (FIT_SCORE_COLUMNS) only
+    search_text_lc = deferred(Column(
+        Text,
+        Computed(OPPORTUNITY_SEARCH_TEXT_LC, persisted=True),
+    ))
     snippet = Column(String(500), nullable=True)
     
     # URLs
@@ -142,6 +168,17 @@ class Opportunity(Base):
         Index('ix_opportunities_score_deadline', 'score', 'deadline_at'),
         Index('ix_opportunities_status_score', 'status', 'score'),
         Index('ix_opportunities_created_status', 'created_at', 'status'),
+        Index('ix_opportunities_status_created', 'status', 'created_at'),
+        Index('ix_opportunities_status_deadline', 'status', 'deadline_at'),
+        Index('ix_opportunities_status_budget', 'status', 'budget_amount'),
+        Index(
+            'ix_opportunities_budget_present', 'budget_amount',
+            postgresql_where=budget_amount.isnot(None),
+        ),
+        # Keyset pagination order: (sort column DESC NULLS LAST, id DESC)
+        Index('ix_opportunities_score_id', score.desc().nulls_last(), id.desc()),
+        Index('ix_opportunities_created_id', created_at.desc().nulls_last(), id.desc()),
+        Index('ix_opportunities_search_tsv', 'search_tsv', postgresql_using='gin'),
     )
     
     def __repr__(self):
@@ -162,6 +199,10 @@ class OpportunityNote(Base):
     # Relationships
     opportunity = relationship("Opportunity", back_populates="notes")
     author = relationship("User", back_populates="notes")
+    
+    __table_args__ = (
+        Index('ix_opportunity_notes_opportunity_created', 'opportunity_id', created_at.desc()),
+    )
 
 
 class OpportunityTask(Base):
@@ -182,6 +223,10 @@ class OpportunityTask(Base):
     # Relationships
     opportunity = relationship("Opportunity", back_populates="tasks")
     assigned_to = relationship("User", back_populates="tasks")
+    
+    __table_args__ = (
+        Index('ix_opportunity_tasks_opportunity_due', 'opportunity_id', 'due_date'),
+    )
 
 
 class OpportunityTag(Base):
@@ -14,8 +14,8 @@ from sqlalchemy import (
     Column, String, Text, Boolean, DateTime, Date, Enum, ForeignKey,
     Integer, Float, Numeric, JSON, Index, UniqueConstraint
 )
-from sqlalchemy.dialects.postgresql import UUID, ARRAY
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import UUID, ARRAY, JSONB
+from sqlalchemy.orm import relationship, reconstructor
 
 from app.db.base import Base
 
@@ -34,6 +34,16 @@ class ProfileObjective(str, PyEnum):
     PUBLIC_TENDER = "PUBLIC_TENDER"
 
 
+# Fit score weights, in the order of Profile.weights_vec
+DEFAULT_FIT_WEIGHTS = {
+    "score_base": 0.4,      # Weight for base opportunity score
+    "budget_match": 0.2,    # Weight for budget match
+    "deadline_proximity": 0.15,  # Weight for deadline proximity
+    "contact_present": 0.15,     # Weight for having contact info
+    "location_match": 0.1,       # Weight for location match
+}
+
+
 class Profile(Base):
     """
     User-defined profile for opportunity matching.
@@ -64,13 +74,7 @@ class Profile(Base):
     objectives = Column(ARRAY(String), default=list)  # List of ProfileObjective values
     
     # Scoring weights (how to compute fit score)
-    weights = Column(JSON, default=lambda: {
-        "score_base": 0.4,      # Weight for base opportunity score
-        "budget_match": 0.2,    # Weight for budget match
-        "deadline_proximity": 0.15,  # Weight for deadline proximity
-        "contact_present": 0.15,     # Weight for having contact info
-        "location_match": 0.1,       # Weight for location match
-    })
+    weights = Column(JSON, default=lambda: dict(DEFAULT_FIT_WEIGHTS))
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -80,6 +84,20 @@ class Profile(Base):
     shortlists = relationship("DailyShortlist", back_populates="profile", cascade="all, delete-orphan")
     opportunity_scores = relationship("OpportunityProfileScore", back_populates="profile", cascade="all, delete-orphan")
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.refresh_fit_cache()
+
+    @reconstructor
+    def refresh_fit_cache(self):
+        """Precompute what fit scoring reads from the profile (call again after editing it)"""
+        self.regions_lc = frozenset(r.lower() for r in self.regions or ())
+        self.cities_lc = frozenset(c.lower() for c in self.cities or ())
+        weights = self.weights or DEFAULT_FIT_WEIGHTS
+        self.weights_vec = tuple(
+            weights.get(key, default) for key, default in DEFAULT_FIT_WEIGHTS.items()
+        )
+
     def __repr__(self):
         return f"<Profile {self.name}>"
 
@@ -150,8 +168,8 @@ class DailyShortlist(Base):
     date = Column(Date, nullable=False, index=True)
     profile_id = Column(Integer, ForeignKey('profiles.id', ondelete='CASCADE'), nullable=False)
     
-    # Shortlist items (JSON array)
-    items = Column(JSON, nullable=False, default=list)
+    # Shortlist items (JSONB array)
+    items = Column(JSONB, nullable=False, default=list)
     # Format: [
     #   {
     #     "opportunity_id": "uuid",
@@ -177,7 +195,7 @@ class DailyShortlist(Base):
     
     __table_args__ = (
         UniqueConstraint('date', 'profile_id', name='uq_daily_shortlist_date_profile'),
-        Index('ix_shortlist_date_profile', 'date', 'profile_id'),
+        Index('ix_daily_shortlist_profile_date', 'profile_id', 'date', unique=True),
     )
 
     def __repr__(self):
@@ -2,9 +2,11 @@
 Database session configuration
 """
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from app.core.config import settings
 
@@ -45,3 +47,39 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+
+# Async engine (asyncpg) for `async def` endpoints that must not block
+# a threadpool worker while waiting on the database.
+# No pre-ping: a dropped connection fails one query, after which
+# SQLAlchemy invalidates the pool and reconnects; pool_recycle keeps
+# connections from outliving server-side idle timeouts.
+async_engine = create_async_engine(
+    make_url(settings.database_url).set(drivername="postgresql+asyncpg").update_query_dict(
+        {"prepared_statement_cache_size": "256"}
+    ),
+    pool_pre_ping=False,
+    pool_size=20,
+    max_overflow=20,
+    pool_recycle=1800,
+    echo=False,
+    connect_args={
+        "statement_cache_size": 256,  # asyncpg-side prepared statements
+        "server_settings": {
+            "statement_timeout": "30000",
+            "application_name": "botagency",
+        },
+    },
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -10,6 +10,7 @@ class EnrichmentConfig(BaseSettings):
     # Viberate Web Scraping
     viberate_enabled: bool = True
     viberate_request_delay: float = 1.5  # seconds between requests (rate limiting)
+    viberate_burst: int = 3  # requests allowed back-to-back before throttling
     timeout_viberate: int = 30  # seconds
     
     # Cache TTLs (seconds)
@@ -3,8 +3,10 @@ Viberate Web Scraping Provider
 Fetches monthly listeners + social followers from Viberate.com
 """
 import logging
+import random
 import re
 import asyncio
+import time
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from urllib.parse import quote
@@ -17,6 +19,65 @@ from .base import BaseProvider
 logger = logging.getLogger(__name__)
 
 
+class ViberateLimiter:
+    """
+    Token bucket shared by all Viberate requests.
+    
+    Refills one token every `interval` seconds up to `burst`, and follows
+    the server's hints: X-RateLimit-Remaining/Reset headers and 429
+    Retry-After pause the bucket until the advertised reset.
+    """
+    
+    def __init__(self, interval: float, burst: int = 1):
+        self.interval = max(interval, 0.001)
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        self.tokens = min(self.burst, self.tokens + elapsed / self.interval)
+        self.updated_at = now
+    
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * self.interval)
+    
+    def block_for(self, seconds: float):
+        """Pause all requests for `seconds`"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+    
+    def update_from_headers(self, headers):
+        """Honour X-RateLimit-Remaining / X-RateLimit-Reset when present"""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining = int(remaining)
+            reset = float(reset)
+        except ValueError:
+            return
+        if remaining <= 0:
+            # Reset is either seconds-from-now or an epoch timestamp
+            wait = reset - time.time() if reset > 1_000_000_000 else reset
+            if wait > 0:
+                self.block_for(wait)
+
+
 class ViberateProvider(BaseProvider):
     """
     Web scraping provider for Viberate.com
@@ -41,10 +102,38 @@ class ViberateProvider(BaseProvider):
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
     ]
     
+    MAX_BACKOFF = 30  # seconds
+    
     def __init__(self, config, cache_client=None):
         super().__init__(config, cache_client)
         self._user_agent_index = 0
         self._http_client: Optional[httpx.AsyncClient] = None
+        self.limiter = ViberateLimiter(config.viberate_request_delay, config.viberate_burst)
+    
+    async def _request(self, url: str) -> httpx.Response:
+        """
+        GET through the rate limiter, retrying 429s with Retry-After or
+        exponential backoff + jitter
+        """
+        client = await self._get_client()
+        
+        # First attempt plus up to max_retries retries (at least one request)
+        retries = max(0, self.config.max_retries)
+        for attempt in range(retries + 1):
+            await self.limiter.acquire()
+            response = await client.get(url, headers=self._get_headers())
+            self.limiter.update_from_headers(response.headers)
+            
+            if response.status_code != 429 or attempt == retries:
+                return response
+            
+            try:
+                delay = float(response.headers.get("Retry-After"))
+            except (TypeError, ValueError):
+                delay = 2 ** attempt + random.random()
+            delay = min(delay, self.MAX_BACKOFF)
+            logger.warning(f"Viberate rate limited, retrying in {delay:.1f}s")
+            self.limiter.block_for(delay)
     
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client with current user agent"""
@@ -85,12 +174,11 @@ class ViberateProvider(BaseProvider):
         Returns:
             Viberate profile URL or None
         """
-        client = await self._get_client()
         search_query = quote(artist_name)
         search_url = f"{self.SEARCH_URL}?q={search_query}"
         
         try:
-            response = await client.get(search_url, headers=self._get_headers())
+            response = await self._request(search_url)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -134,8 +222,7 @@ class ViberateProvider(BaseProvider):
         direct_url = f"{self.BASE_URL}/artist/{spotify_id}"
         
         try:
-            client = await self._get_client()
-            response = await client.get(direct_url, headers=self._get_headers())
+            response = await self._request(direct_url)
             
             if response.status_code == 200:
                 return direct_url
@@ -184,8 +271,6 @@ class ViberateProvider(BaseProvider):
         - instagram_followers
         - tiktok_followers
         """
-        client = await self._get_client()
-        
         result = {
             "monthly_listeners": None,
             "spotify_followers": None,
@@ -197,10 +282,7 @@ class ViberateProvider(BaseProvider):
         }
         
         try:
-            # Add delay to avoid rate limiting
-            await asyncio.sleep(self.config.viberate_request_delay)
-            
-            response = await client.get(profile_url, headers=self._get_headers())
+            response = await self._request(profile_url)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -417,9 +499,6 @@ class ViberateProvider(BaseProvider):
             except Exception as e:
                 logger.error(f"Batch fetch failed for {artist_id}: {e}")
                 results[artist_id] = None
-            
-            # Rate limiting between requests
-            await asyncio.sleep(self.config.viberate_request_delay)
         
         return results
     
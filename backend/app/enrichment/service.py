@@ -2,6 +2,7 @@
 Artist Enrichment Service
 Orchestrates all providers - Uses Viberate for web scraping
 """
+import asyncio
 import logging
 import re
 from typing import Optional, List
@@ -24,6 +25,9 @@ from .providers.wikidata import WikidataProvider
 
 logger = logging.getLogger(__name__)
 
+SPOTIFY_ID_RE = re.compile(r'^[a-zA-Z0-9]{22}$')
+SPOTIFY_ARTIST_URL_RE = re.compile(r'artist/([a-zA-Z0-9]{22})')
+
 
 class ArtistEnrichmentService:
     """
@@ -55,11 +59,11 @@ class ArtistEnrichmentService:
     def _extract_spotify_id(self, input_str: str) -> str:
         """Extract Spotify artist ID from URL or ID"""
         # If already an ID
-        if re.match(r'^[a-zA-Z0-9]{22}$', input_str):
+        if SPOTIFY_ID_RE.match(input_str):
             return input_str
         
         # Extract from URL
-        match = re.search(r'artist/([a-zA-Z0-9]{22})', input_str)
+        match = SPOTIFY_ARTIST_URL_RE.search(input_str)
         if match:
             return match.group(1)
         
@@ -156,36 +160,51 @@ class ArtistEnrichmentService:
         """
         logger.info(f"Starting batch enrichment for {len(spotify_artist_ids)} artists")
         
-        # Extract IDs
-        artist_ids = [self._extract_spotify_id(aid) for aid in spotify_artist_ids]
+        # Bounded fan-out: providers are I/O bound, but Viberate is scraped
+        # so keep concurrency at the configured budget
+        semaphore = asyncio.Semaphore(self.config.batch_concurrency)
+        
+        async def enrich_one(artist_input: str) -> EnrichedArtistData:
+            async with semaphore:
+                return await self.enrich(artist_input, force_refresh)
+        
+        outcomes = await asyncio.gather(
+            *(enrich_one(aid) for aid in spotify_artist_ids),
+            return_exceptions=True,
+        )
         
-        # Fetch other data individually (sequential for web scraping rate limits)
         results = []
-        for artist_id in artist_ids:
-            try:
-                # Use main enrich method for each artist
-                result = await self.enrich(artist_id, force_refresh)
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Batch enrichment failed for {artist_id}: {e}")
-                # Create empty result
-                results.append(EnrichedArtistData(
-                    artist=ArtistInfo(
-                        id=artist_id,
-                        name="Unknown",
-                        spotify_id=artist_id,
-                        spotify_url=f"https://open.spotify.com/artist/{artist_id}"
-                    ),
-                    monthly_listeners=MonthlyListenersData(),
-                    social_stats=SocialStatsData(),
-                    spotify=SpotifyData(),
-                    labels=LabelsData(),
-                    management=ManagementData(),
-                    notes=[f"Enrichment failed: {str(e)}"]
-                ))
+        for artist_input, outcome in zip(spotify_artist_ids, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Batch enrichment failed for {artist_input}: {outcome}")
+                results.append(self._failed_result(artist_input, outcome))
+            else:
+                results.append(outcome)
         
         return results
     
+    def _failed_result(self, artist_input: str, error: Exception) -> EnrichedArtistData:
+        """Empty result carrying the failure reason, so one artist can't sink a batch"""
+        try:
+            artist_id = self._extract_spotify_id(artist_input)
+        except ValueError:
+            artist_id = artist_input
+        
+        return EnrichedArtistData(
+            artist=ArtistInfo(
+                id=artist_id,
+                name="Unknown",
+                spotify_id=artist_id,
+                spotify_url=f"https://open.spotify.com/artist/{artist_id}"
+            ),
+            monthly_listeners=MonthlyListenersData(),
+            social_stats=SocialStatsData(),
+            spotify=SpotifyData(),
+            labels=LabelsData(),
+            management=ManagementData(),
+            notes=[f"Enrichment failed: {str(error)}"]
+        )
+    
     async def close(self):
         """Close all providers"""
         await self.viberate_provider.close()
@@ -26,8 +26,9 @@ from app.api import (
 )
 from app.api.predictions import router as predictions_router, reports_router
 from app.api.artist_history import router as artist_history_router
-from app.api.enrichment import router as enrichment_router
+from app.api.enrichment import router as enrichment_router, create_enrichment_service
 from app.api.sso import router as sso_router
+from app.core.sso import close_http_client as close_sso_http_client
 from app.api.ai_intelligence import router as ai_intelligence_router
 from app.api.collection import router as collection_router
 from app.api.websocket import router as websocket_router
@@ -180,6 +181,7 @@ app.include_router(websocket_router)
 @app.on_event("startup")
 async def startup_event():
     logger.info(f"Starting {settings.app_name}")
+    app.state.enrichment = create_enrichment_service()
     # Database tables are managed by Alembic migrations
     # No need for create_all() - it causes conflicts with existing indexes
     logger.info("Application started successfully")
@@ -188,3 +190,5 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info(f"Shutting down {settings.app_name}")
+    await app.state.enrichment.close()
+    await close_sso_http_client()
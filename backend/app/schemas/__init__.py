@@ -15,7 +15,7 @@ from .user import (
 # Legacy V1 Opportunity schemas (used by /api/v1/opportunities)
 from .opportunity import (
     OpportunityCreate, OpportunityUpdate, OpportunityResponse,
-    OpportunityListResponse, OpportunityFilters,
+    OpportunityListResponse, OpportunityFilters, OpportunityDetailResponse,
     NoteCreate, NoteResponse,
     TaskCreate, TaskUpdate, TaskResponse,
     TagCreate, TagResponse,
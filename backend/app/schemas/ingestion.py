@@ -5,13 +5,15 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, ConfigDict, validator
 
 from app.db.models.ingestion import IngestionStatus
 
 
 class IngestionSearchParams(BaseModel):
     """Search parameters for targeted ingestion"""
+    model_config = ConfigDict(extra="forbid", frozen=True, str_strip_whitespace=True)
+    
     keywords: Optional[str] = None  # Comma-separated keywords
     region: Optional[str] = None
     city: Optional[str] = None
@@ -49,6 +51,8 @@ class IngestionRunResponse(BaseModel):
 
 class IngestionTriggerRequest(BaseModel):
     """Request to trigger ingestion"""
+    model_config = ConfigDict(extra="forbid", frozen=True)
+    
     source_ids: Optional[List[int]] = None  # If None, run all active sources
     source_types: Optional[List[str]] = None  # Filter by type
     search_params: Optional[IngestionSearchParams] = None  # Search criteria
@@ -82,10 +82,11 @@ class OpportunityResponse(OpportunityBase):
 class OpportunityListResponse(BaseModel):
     """Paginated opportunity list response"""
     items: List[OpportunityResponse]
-    total: int
+    total: Optional[int] = None  # None in cursor mode unless include_total
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class OpportunityFilters(BaseModel):
@@ -160,6 +161,12 @@ class TaskResponse(BaseModel):
         from_attributes = True
 
 
+class OpportunityDetailResponse(OpportunityResponse):
+    """Opportunity with its notes and tasks (one round trip for the detail view)"""
+    notes: List[NoteResponse] = []
+    tasks: List[TaskResponse] = []
+
+
 # Tags
 class TagCreate(BaseModel):
     """Create tag schema"""
@@ -131,6 +131,14 @@ class ShortlistListResponse(BaseModel):
     total: int
 
 
+class ShortlistTaskResponse(BaseModel):
+    """Shortlist generation queued as a background task (poll /ingestion/task/{task_id})"""
+    profile_id: int
+    date: date
+    task_id: str
+    message: str
+
+
 # ============================================================================
 # CLUSTERS
 # ============================================================================
@@ -228,6 +236,17 @@ class SourceHealthMetrics(BaseModel):
     class Config:
         from_attributes = True
 
+    @classmethod
+    def from_record(cls, h, source_name: str) -> "SourceHealthMetrics":
+        """Build from a SourceHealth row without revalidating typed DB columns"""
+        fields = {
+            c.name: getattr(h, c.name)
+            for c in h.__table__.columns
+            if c.name in cls.model_fields
+        }
+        fields["error_types"] = fields.get("error_types") or {}
+        return cls.model_construct(source_name=source_name, **fields)
+
 
 class SourceHealthListResponse(BaseModel):
     """List of source health metrics"""
@@ -308,3 +327,10 @@ class RecomputeResponse(BaseModel):
     profile_id: int
     opportunities_processed: int
     duration_seconds: float
+
+
+class RecomputeTaskResponse(BaseModel):
+    """Recompute queued as a background task (poll /ingestion/task/{task_id})"""
+    profile_id: int
+    task_id: str
+    message: str
@@ -11,6 +11,7 @@ from datetime import datetime, timedelta, date
 from typing import List, Dict, Any, Optional
 import hashlib
 import re
+import time
 from collections import defaultdict
 
 from celery import shared_task
@@ -29,6 +30,7 @@ from app.db.models.radar_features import (
     SourceHealth, ContactFinderResult
 )
 from app.core.config import settings
+from app.core.cache import cache_delete, invalidate_cache
 
 
 def get_db() -> Session:
@@ -266,6 +268,7 @@ def daily_shortlist_job(profile_id: Optional[int] = None):
             logger.success(f"  ✅ Shortlist générée: {len(items)} opportunités")
         
         db.commit()
+        invalidate_cache("shortlists:today")
         logger.success(f"🎉 {generated_count} shortlists générées")
         
         return {"status": "success", "generated": generated_count}
@@ -278,6 +281,73 @@ def daily_shortlist_job(profile_id: Optional[int] = None):
         db.close()
 
 
+@celery_app.task(name="app.workers.radar_features_tasks.generate_shortlist_job")
+def generate_shortlist_job(profile_id: int, target_date: str, limit: int = 20):
+    """
+    Build one profile's shortlist (queued from POST /shortlists/generate).
+    Returns the shortlist as serialized by the API.
+    """
+    from app.api.shortlists import build_shortlist, shortlist_response
+    
+    logger = get_task_logger("SHORTLIST")
+    
+    db = get_db()
+    try:
+        profile = db.get(Profile, profile_id)
+        if not profile:
+            logger.warning(f"Profil {profile_id} introuvable")
+            return {"status": "not_found", "profile_id": profile_id}
+        
+        shortlist = build_shortlist(db, profile, date.fromisoformat(target_date), limit)
+        logger.success(f"✅ Shortlist générée pour {profile.name}: {shortlist.items_count} opportunités")
+        
+        return shortlist_response(shortlist).model_dump(mode="json")
+        
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erreur génération shortlist: {e}")
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.workers.radar_features_tasks.recompute_profile_scores_job")
+def recompute_profile_scores_job(profile_id: int, only_new: bool = True, limit: int = 1000):
+    """
+    Recompute fit scores for a profile (queued from POST /profiles/{id}/recompute).
+    Commits per chunk; see app.api.profiles.recompute_scores.
+    """
+    from app.api.profiles import recompute_scores
+    
+    logger = get_task_logger("FIT_SCORE")
+    start_time = time.time()
+    
+    db = get_db()
+    try:
+        profile = db.get(Profile, profile_id)
+        if not profile:
+            logger.warning(f"Profil {profile_id} introuvable")
+            return {"status": "not_found", "profile_id": profile_id}
+        
+        processed = recompute_scores(db, profile, only_new, limit)
+        duration = time.time() - start_time
+        logger.success(f"✅ {processed} fit scores recalculés pour {profile.name} en {duration:.1f}s")
+        
+        return {
+            "status": "success",
+            "profile_id": profile_id,
+            "opportunities_processed": processed,
+            "duration_seconds": round(duration, 2),
+        }
+        
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Erreur recalcul fit scores: {e}")
+        raise
+    finally:
+        db.close()
+
+
 # ============================================================================
 # CLUSTER REBUILD - Détection de doublons et regroupement
 # ============================================================================
@@ -562,6 +632,8 @@ def source_health_rollup_job():
     logger = get_task_logger("HEALTH")
     logger.info(f"🏥 Calcul de la santé des sources...")
     
+    from app.api.source_health import compute_health_score
+    
     db = get_db()
     try:
         sources = db.query(SourceConfig).filter(SourceConfig.is_active == True).all()
@@ -577,68 +649,50 @@ def source_health_rollup_job():
         for source in sources:
             # Get opportunities ingested yesterday
             opps_count = db.query(func.count(Opportunity.id)).filter(
-                Opportunity.source_id == source.id,
+                Opportunity.source_config_id == source.id,
                 func.date(Opportunity.created_at) == yesterday
             ).scalar() or 0
             
-            # Get average score of opportunities
-            avg_score = db.query(func.avg(Opportunity.score)).filter(
-                Opportunity.source_id == source.id,
-                func.date(Opportunity.created_at) == yesterday
-            ).scalar() or 0.0
-            
             # Calculate duplicates (opportunities in clusters)
             duplicates = db.query(func.count(OpportunityClusterMember.id)).join(
                 Opportunity,
                 OpportunityClusterMember.opportunity_id == Opportunity.id
             ).filter(
-                Opportunity.source_id == source.id,
+                Opportunity.source_config_id == source.id,
                 func.date(Opportunity.created_at) == yesterday
             ).scalar() or 0
             
             # Error rate (simplified - based on ingestion runs)
             from app.db.models.ingestion import IngestionRun, IngestionStatus
             
-            runs = db.query(IngestionRun).filter(
-                IngestionRun.source_id == source.id,
+            runs = db.query(IngestionRun.status).filter(
+                IngestionRun.source_config_id == source.id,
                 func.date(IngestionRun.started_at) == yesterday
             ).all()
             
             error_count = sum(1 for r in runs if r.status == IngestionStatus.FAILED)
             total_runs = len(runs)
-            error_rate = (error_count / total_runs * 100) if total_runs > 0 else 0.0
-            
-            # Freshness (hours since last opportunity)
-            last_opp = db.query(Opportunity).filter(
-                Opportunity.source_id == source.id
-            ).order_by(desc(Opportunity.created_at)).first()
             
-            if last_opp:
-                hours_since = (datetime.utcnow() - last_opp.created_at).total_seconds() / 3600
-            else:
-                hours_since = 999.0
-            
-            # Calculate overall health score
-            health_score = 100.0
-            health_score -= min(50, error_rate)  # Up to 50 points for errors
-            if hours_since > 48:
-                health_score -= 20  # Stale source
-            elif hours_since > 24:
-                health_score -= 10
-            if avg_score < 50:
-                health_score -= 10
-            health_score = max(0, health_score)
+            metrics = {
+                "requests": total_runs,
+                "success_count": total_runs - error_count,
+                "error_count": error_count,
+                "success_rate": (total_runs - error_count) / total_runs if total_runs > 0 else 1.0,
+                "items_found": opps_count,
+                "items_kept": opps_count,
+                "items_new": opps_count,
+                "duplicates_count": duplicates,
+                "duplicates_rate": duplicates / opps_count if opps_count > 0 else 0.0,
+            }
+            # Score is stored at write time so reads can aggregate it in SQL
+            health_score = compute_health_score(metrics)
             
             # Create health record
             health = SourceHealth(
                 source_id=source.id,
                 date=yesterday,
-                opportunities_found=opps_count,
-                duplicates_found=duplicates,
-                avg_score=avg_score,
-                error_rate=error_rate,
-                freshness_hours=hours_since,
-                health_score=health_score
+                health_score=health_score,
+                **metrics,
             )
             db.add(health)
             processed += 1
@@ -648,6 +702,7 @@ def source_health_rollup_job():
             logger.info(f"  {status} {source.name}: {health_score:.0f}%")
         
         db.commit()
+        cache_delete("source_health:overview")
         logger.success(f"✅ {processed} sources analysées")
         
         return {"status": "success", "processed": processed}
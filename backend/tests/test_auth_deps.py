@@ -0,0 +1,100 @@
+"""
+Tests for authentication dependencies
+"""
+import pytest
+from cachetools import TTLCache
+from fastapi import HTTPException
+from unittest.mock import patch, MagicMock
+
+from app.api import deps
+from app.db.models.user import Role
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+class FakeRedis:
+    """Minimal stand-in for the Redis keys shared by all workers"""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def incr(self, key):
+        self.store[key] = str(int(self.store.get(key) or 0) + 1)
+        return int(self.store[key])
+
+
+@pytest.fixture
+def shared_redis():
+    """Redis shared by every simulated worker"""
+    fake = FakeRedis()
+    with patch.object(deps, "redis_client", fake):
+        yield fake
+
+
+@pytest.fixture
+def user_row():
+    """Users row returned by the auth SELECT"""
+    row = MagicMock()
+    row.id = 42
+    row.role = Role.BIZDEV
+    row.is_active = True
+    row.is_superuser = False
+    return row
+
+
+@pytest.fixture
+def db(user_row):
+    """Session whose users query returns user_row"""
+    session = MagicMock()
+    session.query.return_value.filter.return_value.first.return_value = user_row
+    return session
+
+
+# ============================================================================
+# USER CACHE TESTS
+# ============================================================================
+
+class TestUserCache:
+    """Tests for the per-process auth user cache"""
+
+    def test_cache_hit_skips_query(self, shared_redis, db):
+        """Test a cached user is served without querying the database"""
+        with patch.object(deps, "_user_cache", TTLCache(maxsize=10, ttl=60)):
+            deps._load_user(42, db)
+            deps._load_user(42, db)
+        assert db.query.call_count == 1
+
+    def test_deactivation_from_another_worker(self, shared_redis, db, user_row):
+        """Test deactivating a user takes effect on a worker that cached them"""
+        this_worker = TTLCache(maxsize=10, ttl=60)
+        other_worker = TTLCache(maxsize=10, ttl=60)
+
+        with patch.object(deps, "_user_cache", this_worker):
+            assert deps._load_user(42, db).is_active
+
+        # Admin request handled by another worker
+        user_row.is_active = False
+        with patch.object(deps, "_user_cache", other_worker):
+            deps.forget_user(42)
+
+        with patch.object(deps, "_user_cache", this_worker), \
+                patch.object(deps, "verify_access_token_cached", return_value="42"):
+            assert 42 in this_worker
+            with pytest.raises(HTTPException) as exc:
+                deps._authenticate("token", db)
+        assert exc.value.status_code == 403
+
+    def test_redis_down_bypasses_cache(self, db):
+        """Test the cache is not trusted when invalidations can't be seen"""
+        broken = MagicMock()
+        broken.get.side_effect = ConnectionError
+        with patch.object(deps, "redis_client", broken), \
+                patch.object(deps, "_user_cache", TTLCache(maxsize=10, ttl=60)):
+            deps._load_user(42, db)
+            deps._load_user(42, db)
+        assert db.query.call_count == 2
@@ -45,6 +45,18 @@ def auth_headers():
     return {"Authorization": "Bearer test-token"}
 
 
+@pytest.fixture
+def authed_client(client: TestClient):
+    """Test client with the user/admin auth dependencies overridden"""
+    from app.api.deps import get_current_user, get_current_admin_user
+    
+    user = MagicMock()
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_current_admin_user] = lambda: user
+    yield client
+    app.dependency_overrides.clear()
+
+
 @pytest.fixture
 def sample_profile(db_session: Session):
     """Create a sample profile for testing"""
@@ -171,6 +183,27 @@ class TestProfilesAPI:
         
         assert response.status_code in [200, 401, 404]
 
+    def test_recompute_profile_scores(self, authed_client: TestClient, sample_profile: Profile):
+        """Test fit score recompute is queued"""
+        with patch("app.workers.radar_features_tasks.recompute_profile_scores_job.delay") as delay:
+            delay.return_value = MagicMock(id="task-456")
+            response = authed_client.post(
+                f"/api/v1/profiles/{sample_profile.id}/recompute",
+                json={"only_new": False, "limit": 50},
+            )
+        
+        assert response.status_code == 202
+        assert response.json()["task_id"] == "task-456"
+        delay.assert_called_once_with(sample_profile.id, False, 50)
+
+    def test_recompute_unknown_profile(self, authed_client: TestClient):
+        """Test recompute for a missing profile"""
+        with patch("app.workers.radar_features_tasks.recompute_profile_scores_job.delay") as delay:
+            response = authed_client.post("/api/v1/profiles/999999/recompute")
+        
+        assert response.status_code == 404
+        delay.assert_not_called()
+
     def test_delete_profile(self, client: TestClient, auth_headers: dict):
         """Test profile deletion"""
         with patch("app.api.deps.get_current_user"):
@@ -200,12 +233,28 @@ class TestShortlistsAPI:
         
         assert response.status_code in [200, 401]
 
-    def test_generate_shortlist(self, client: TestClient, auth_headers: dict):
-        """Test manual shortlist generation"""
-        with patch("app.api.deps.get_current_user"):
-            response = client.post("/api/v1/shortlists/generate", headers=auth_headers)
+    def test_generate_shortlist(self, authed_client: TestClient, sample_profile: Profile):
+        """Test manual shortlist generation is queued"""
+        with patch("app.workers.radar_features_tasks.generate_shortlist_job.delay") as delay:
+            delay.return_value = MagicMock(id="task-123")
+            response = authed_client.post(
+                "/api/v1/shortlists/generate",
+                params={"profile_id": sample_profile.id, "limit": 10},
+            )
         
-        assert response.status_code in [200, 401]
+        assert response.status_code == 202
+        assert response.json()["task_id"] == "task-123"
+        delay.assert_called_once_with(sample_profile.id, date.today().isoformat(), 10)
+
+    def test_generate_shortlist_unknown_profile(self, authed_client: TestClient):
+        """Test shortlist generation for a missing profile"""
+        with patch("app.workers.radar_features_tasks.generate_shortlist_job.delay") as delay:
+            response = authed_client.post(
+                "/api/v1/shortlists/generate", params={"profile_id": 999999}
+            )
+        
+        assert response.status_code == 404
+        delay.assert_not_called()
 
 
 # ============================================================================
@@ -342,39 +391,44 @@ class TestUtilityFunctions:
         """Test fit score computation"""
         from app.api.profiles import compute_fit_score
         
-        # Mock opportunity with correct attributes
-        opp = MagicMock()
-        opp.score = 80
-        opp.budget_amount = 15000
-        opp.deadline_at = datetime.now() + timedelta(days=10)
-        opp.title = "Festival Summer 2024"
-        opp.description = "A great festival opportunity"
-        opp.contact_email = "contact@festival.org"
-        opp.contact_phone = None
-        opp.location_region = "Île-de-France"
-        opp.location_city = "Paris"
-        
-        # Mock profile with correct attributes
-        profile = MagicMock()
-        profile.weights = {
-            "score_base": 0.4,
-            "budget_match": 0.2,
-            "deadline_proximity": 0.15,
-            "contact_present": 0.15,
-            "location_match": 0.1
-        }
-        profile.budget_min = 5000
-        profile.budget_max = 50000
-        profile.keywords_include = ["festival"]
-        profile.keywords_exclude = []
-        profile.regions = ["Île-de-France"]
-        profile.cities = ["Paris"]
-        
-        # compute_fit_score returns (score, reasons)
-        result = compute_fit_score(opp, profile)
-        score = result[0] if isinstance(result, tuple) else result
-        
-        assert 0 <= score <= 100
+        # Unsaved opportunity: keyword text is built from title/description
+        opp = Opportunity(
+            score=80,
+            budget_amount=15000,
+            deadline_at=datetime.utcnow() + timedelta(days=60),  # outside the 30-day bonus
+            title="Festival Summer 2024",
+            description="A great festival opportunity",
+            contact_email="contact@festival.org",
+            contact_phone=None,
+            location_region="Île-de-France",
+            location_city="Paris",
+        )
+        
+        # Real profile: __init__ precomputes weights_vec / regions_lc / cities_lc
+        profile = Profile(
+            name="Fit test",
+            weights={
+                "score_base": 0.4,
+                "budget_match": 0.2,
+                "deadline_proximity": 0.15,
+                "contact_present": 0.15,
+                "location_match": 0.1
+            },
+            budget_min=5000,
+            budget_max=50000,
+            keywords_include=["festival"],
+            keywords_exclude=[],
+            regions=["Île-de-France"],
+            cities=["Paris"],
+        )
+        
+        score, reasons = compute_fit_score(opp, profile)
+        
+        # 80 * 0.4 + 100 * (0.2 budget + 0.15 contact + 0.1 location)
+        assert score == 77
+        assert reasons["keyword_matches"] == ["festival"]
+        assert reasons["budget_match"] and reasons["contact_present"] and reasons["location_match"]
+        assert not reasons["deadline_soon"]
 
     def test_normalize_url(self):
         """Test URL normalization"""
@@ -495,6 +549,144 @@ class TestIntegration:
         assert isinstance(reasons, list)
         assert all("emoji" in r and "label" in r for r in reasons)
 
+    def test_build_shortlist_upserts_top_items(self, db_session: Session, sample_profile: Profile, sample_opportunity: Opportunity):
+        """Test build_shortlist keeps one row per (profile, date) with the top `limit` items"""
+        from app.api.shortlists import build_shortlist
+        
+        today = date.today()
+        try:
+            first = build_shortlist(db_session, sample_profile, today, 5)
+            first_id = first.id
+            assert first.items_count == len(first.items) <= 5
+            # Copied out: the upsert below refreshes this same ORM object
+            fit_scores = [item["fit_score"] for item in first.items]
+            assert fit_scores == sorted(fit_scores, reverse=True)
+            
+            # Regenerating the same date replaces the row instead of adding one
+            second = build_shortlist(db_session, sample_profile, today, 1)
+            assert second.id == first_id
+            assert second.items_count == len(second.items) == min(1, len(fit_scores))
+            if fit_scores:
+                assert second.items[0]["fit_score"] == fit_scores[0]
+            
+            rows = db_session.query(DailyShortlist).filter(
+                DailyShortlist.profile_id == sample_profile.id,
+                DailyShortlist.date == today,
+            ).count()
+            assert rows == 1
+        finally:
+            db_session.query(DailyShortlist).filter(
+                DailyShortlist.profile_id == sample_profile.id
+            ).delete(synchronize_session=False)
+            db_session.commit()
+
+    def test_generate_shortlist_job(self, db_session: Session, sample_profile: Profile):
+        """Test the queued shortlist job returns the serialized shortlist"""
+        from app.workers.radar_features_tasks import generate_shortlist_job
+        
+        today = date.today()
+        try:
+            result = generate_shortlist_job.run(sample_profile.id, today.isoformat(), 5)
+            assert result["profile_id"] == sample_profile.id
+            assert result["date"] == today.isoformat()
+            assert result["items_count"] == len(result["items"]) <= 5
+        finally:
+            db_session.query(DailyShortlist).filter(
+                DailyShortlist.profile_id == sample_profile.id
+            ).delete(synchronize_session=False)
+            db_session.commit()
+        
+        assert generate_shortlist_job.run(999999, today.isoformat(), 5)["status"] == "not_found"
+
+    def test_recompute_profile_scores_job(self, db_session: Session, sample_profile: Profile, sample_opportunity: Opportunity):
+        """Test the queued recompute job upserts one score per opportunity"""
+        from app.workers.radar_features_tasks import recompute_profile_scores_job
+        
+        try:
+            result = recompute_profile_scores_job.run(sample_profile.id, False, 50)
+            assert result["status"] == "success"
+            assert 0 < result["opportunities_processed"] <= 50
+            
+            # Running again updates the same rows
+            recompute_profile_scores_job.run(sample_profile.id, False, 50)
+            rows = db_session.query(OpportunityProfileScore).filter(
+                OpportunityProfileScore.profile_id == sample_profile.id,
+                OpportunityProfileScore.opportunity_id == sample_opportunity.id,
+            ).count()
+            assert rows <= 1
+        finally:
+            db_session.query(OpportunityProfileScore).filter(
+                OpportunityProfileScore.profile_id == sample_profile.id
+            ).delete(synchronize_session=False)
+            db_session.commit()
+        
+        assert recompute_profile_scores_job.run(999999)["status"] == "not_found"
+
+    def test_recompute_scores_excluded_outside_window(self, db_session: Session):
+        """Test excluded opportunities outside the top `limit` don't use up the budget"""
+        import uuid
+        from app.api.profiles import recompute_scores
+
+        marker = f"excl{uuid.uuid4().hex[:8]}"
+        profile = Profile(name=f"Exclude {marker}", keywords_exclude=[marker], is_active=True)
+        db_session.add(profile)
+
+        def make_opp(title, score):
+            return Opportunity(
+                external_id=f"test-{uuid.uuid4().hex[:8]}",
+                title=title,
+                source_type="RSS",
+                source_name="Test Source",
+                status=OpportunityStatus.NEW,
+                score=score,
+            )
+
+        # More excluded rows than `limit`, all ranked below the kept one
+        excluded = [make_opp(f"Concert {marker} {i}", 0) for i in range(3)]
+        db_session.add_all(excluded)
+        db_session.flush()
+        # Highest score and newest id: first in (score DESC, id DESC) order
+        kept = make_opp("Festival booking", 100)
+        db_session.add(kept)
+        db_session.commit()
+
+        try:
+            assert recompute_scores(db_session, profile, False, 1) == 1
+
+            scored = dict(db_session.query(
+                OpportunityProfileScore.opportunity_id, OpportunityProfileScore.fit_score
+            ).filter(OpportunityProfileScore.profile_id == profile.id).all())
+            assert kept.id in scored
+            assert not any(opp.id in scored for opp in excluded)
+        finally:
+            db_session.query(OpportunityProfileScore).filter(
+                OpportunityProfileScore.profile_id == profile.id
+            ).delete(synchronize_session=False)
+            for obj in [kept, *excluded, profile]:
+                db_session.delete(obj)
+            db_session.commit()
+
+    def test_source_health_rollup_job_writes_health(self, db_session: Session, sample_source: SourceConfig):
+        """Test the rollup job stores a SourceHealth row with its health_score"""
+        from app.workers.radar_features_tasks import source_health_rollup_job
+
+        yesterday = date.today() - timedelta(days=1)
+        try:
+            result = source_health_rollup_job.run()
+            assert result["status"] == "success"
+
+            health = db_session.query(SourceHealth).filter(
+                SourceHealth.source_id == sample_source.id,
+                SourceHealth.date == yesterday,
+            ).one()
+            assert health.health_score is not None
+            assert 0 <= health.health_score <= 100
+        finally:
+            db_session.query(SourceHealth).filter(
+                SourceHealth.source_id == sample_source.id
+            ).delete(synchronize_session=False)
+            db_session.commit()
+
     def test_cluster_detection_flow(self, db_session: Session):
         """Test cluster detection for similar opportunities"""
         from app.workers.radar_features_tasks import compute_opportunity_hash, normalize_url
@@ -453,8 +453,8 @@ function ProfilesContent() {
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["shortlists"] });
       addToast({
-        title: "Scores recalculés",
-        description: "Les fit scores ont été mis à jour",
+        title: "Recalcul lancé",
+        description: "Les fit scores sont en cours de mise à jour",
         type: "success",
       });
     },
@@ -881,7 +881,19 @@ export const shortlistsApi = {
     const response = await api.post("/shortlists/generate", null, { 
       params: profileId ? { profile_id: profileId } : {} 
     });
-    return response.data;
+    // Generation runs as a background task: wait for it before returning
+    const taskId: string = response.data.task_id;
+    for (let attempt = 0; attempt < 60; attempt++) {
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+      const { data } = await api.get(`/ingestion/task/${taskId}`);
+      if (data.ready) {
+        if (data.status !== "SUCCESS") {
+          throw new Error(data.error || "Shortlist generation failed");
+        }
+        return data.result;
+      }
+    }
+    throw new Error("Shortlist generation timed out");
   },
 };
 